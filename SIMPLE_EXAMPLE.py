@@ -10,12 +10,19 @@ CatAlert后端项目 - 简化示例
 # API就像餐厅的服务员
 # 客户(前端) → 服务员(API) → 厨师(业务逻辑) → 厨房(数据库)
 
+import itertools
+import os
 from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, List, Optional
 
 # 创建一个FastAPI应用
-app = FastAPI(title="CatAlert 简化版")
+app = FastAPI(title="CatAlert 简化版", default_response_class=ORJSONResponse)
+
+# 压缩大于1KB的响应，移动网络下传输更快
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # =============================================================================
 # 2. 数据模型：如何表示数据？
@@ -30,11 +37,14 @@ class Cat(BaseModel):
     breed: str
     owner_name: str
 
-# 模拟数据库（实际项目中用PostgreSQL）
-cats_database = [
-    Cat(id=1, name="胡胡", age=4, breed="英短", owner_name="小明"),
-    Cat(id=2, name="咪咪", age=2, breed="美短", owner_name="小红")
-]
+# 模拟数据库（实际项目中用PostgreSQL），按ID索引
+cats_database: Dict[int, Cat] = {
+    1: Cat(id=1, name="胡胡", age=4, breed="英短", owner_name="小明"),
+    2: Cat(id=2, name="咪咪", age=2, breed="美短", owner_name="小红")
+}
+
+# ID生成器，相当于数据库的自增主键
+_id_seq = itertools.count(start=max(cats_database, default=0) + 1)
 
 # =============================================================================
 # 3. API端点：如何提供数据服务？
@@ -45,30 +55,30 @@ def read_root():
     """根路径，返回欢迎信息"""
     return {"message": "欢迎使用CatAlert API！", "Hello": "World"}
 
-@app.get("/cats", response_model=List[Cat])
+# 数据来自内存，已经是校验过的模型：直接序列化，跳过响应模型的二次校验
+@app.get("/cats", response_model=None, responses={200: {"model": List[Cat]}})
 def get_all_cats():
     """获取所有猫咪信息"""
-    return cats_database
+    return ORJSONResponse(content=[c.model_dump(mode="json") for c in cats_database.values()])
 
 @app.get("/cats/{cat_id}", response_model=Cat)
 def get_cat_by_id(cat_id: int):
     """根据ID获取特定猫咪信息"""
-    for cat in cats_database:
-        if cat.id == cat_id:
-            return cat
+    cat = cats_database.get(cat_id)
+    if cat:
+        return cat
     return {"error": "猫咪不存在"}
 
-@app.post("/cats", response_model=Cat)
+@app.post("/cats", response_model=None, responses={200: {"model": Cat}})
 def create_cat(cat: Cat):
     """创建新的猫咪记录"""
     # 生成新的ID
-    new_id = max([c.id for c in cats_database if c.id]) + 1
-    cat.id = new_id
+    cat.id = next(_id_seq)
     
     # 添加到数据库
-    cats_database.append(cat)
+    cats_database[cat.id] = cat
     
-    return cat
+    return ORJSONResponse(content=cat.model_dump(mode="json"))
 
 # =============================================================================
 # 4. AI功能：如何添加智能分析？
@@ -76,19 +86,17 @@ def create_cat(cat: Cat):
 
 class AIAnalysis(BaseModel):
     """AI分析结果"""
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+    
     cat_name: str
     health_score: float
     recommendations: List[str]
 
-@app.get("/cats/{cat_id}/ai-analysis", response_model=AIAnalysis)
+@app.get("/cats/{cat_id}/ai-analysis", response_model=None, responses={200: {"model": AIAnalysis}})
 def get_ai_analysis(cat_id: int):
     """获取AI健康分析"""
     # 找到猫咪
-    cat = None
-    for c in cats_database:
-        if c.id == cat_id:
-            cat = c
-            break
+    cat = cats_database.get(cat_id)
     
     if not cat:
         return {"error": "猫咪不存在"}
@@ -111,13 +119,9 @@ def get_ai_analysis(cat_id: int):
 # 5. 如何运行这个示例？
 # =============================================================================
 
-#入口点1：简单启动（不运行测试）
-if __name__ == "__main__":
-    import uvicorn
-    print("启动CatAlert简化版API...")
-    print("访问 http://localhost:8000/docs 查看API文档")
-    print("访问 http://localhost:8000/cats 查看所有猫咪")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+# python SIMPLE_EXAMPLE.py                       启动服务器
+# CATALERT_SELFTEST=1 python SIMPLE_EXAMPLE.py   先运行自测再启动服务器
+# （入口点在文件末尾，导入本模块不会运行任何测试）
 
 # =============================================================================
 # 6. 学习要点总结
@@ -164,7 +168,7 @@ def test_api():
     
     # 测试获取所有猫咪
     print("1. 获取所有猫咪：")
-    for cat in cats_database:
+    for cat in cats_database.values():
         print(f"   - {cat.name} ({cat.breed}, {cat.age}岁)")
     
     # 测试AI分析
@@ -176,22 +180,20 @@ def test_api():
     for rec in analysis.recommendations:
         print(f"     - {rec}")
 
-# 入口点2：完整启动（运行测试 + 启动服务器）
+# 入口点：启动服务器；设置 CATALERT_SELFTEST=1 时先运行自测
 if __name__ == "__main__":
     import sys
     import uvicorn
     
-    # 检查命令行参数
-    if len(sys.argv) > 1 and sys.argv[1] == "--simple":
-        # 简单模式：只启动服务器
-        print("启动CatAlert简化版API...")
-        print("访问 http://localhost:8000/docs 查看API文档")
-        print("访问 http://localhost:8000/cats 查看所有猫咪")
-    else:
-        # 完整模式：运行测试 + 启动服务器
+    # 检查命令行参数和环境变量
+    if os.getenv("CATALERT_SELFTEST") == "1" and "--simple" not in sys.argv[1:]:
+        # 自测模式：运行测试 + 启动服务器
         test_api()
         print("\n" + "="*50)
-        print("启动CatAlert简化版API...")
+    
+    print("启动CatAlert简化版API...")
+    print("访问 http://localhost:8000/docs 查看API文档")
+    print("访问 http://localhost:8000/cats 查看所有猫咪")
     
     # 启动API服务器
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,234 @@
+"""baseline schema
+
+The tables as ``Base.metadata.create_all`` built them at application startup,
+before table creation was limited to DEBUG. Databases created that way should
+be stamped with ``alembic stamp 0001`` and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('timezone', sa.String(length=50), nullable=True),
+    sa.Column('language', sa.String(length=10), nullable=True),
+    sa.Column('notification_enabled', sa.Boolean(), nullable=True),
+    sa.Column('ai_agent_enabled', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('cats',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('gender', sa.String(length=10), nullable=True),
+    sa.Column('breed', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('born_way', sa.String(length=50), nullable=True),
+    sa.Column('birth_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('color', sa.String(length=50), nullable=True),
+    sa.Column('microchip_id', sa.String(length=50), nullable=True),
+    sa.Column('health_condition', sa.String(length=20), nullable=True),
+    sa.Column('medical_notes', sa.Text(), nullable=True),
+    sa.Column('vaccination_records', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('images', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('avatar_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('microchip_id')
+    )
+    op.create_index('ix_cats_owner_active', 'cats', ['owner_id'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_table('ai_insights',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('cat_id', sa.UUID(), nullable=False),
+    sa.Column('insight_type', sa.String(length=50), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('confidence_score', sa.Float(), nullable=True),
+    sa.Column('analysis_period', sa.String(length=50), nullable=True),
+    sa.Column('data_points_analyzed', sa.Integer(), nullable=True),
+    sa.Column('key_findings', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('supporting_evidence', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('recommendations', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('actionable', sa.Boolean(), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('is_acknowledged', sa.Boolean(), nullable=True),
+    sa.Column('user_notes', sa.Text(), nullable=True),
+    sa.Column('generated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['cat_id'], ['cats.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('ai_interactions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('cat_id', sa.UUID(), nullable=True),
+    sa.Column('session_id', sa.String(length=100), nullable=False),
+    sa.Column('interaction_type', sa.String(length=50), nullable=False),
+    sa.Column('user_input', sa.Text(), nullable=False),
+    sa.Column('ai_response', sa.Text(), nullable=False),
+    sa.Column('context', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('intent', sa.String(length=100), nullable=True),
+    sa.Column('confidence_score', sa.Float(), nullable=True),
+    sa.Column('processing_time_ms', sa.Integer(), nullable=True),
+    sa.Column('model_used', sa.String(length=100), nullable=True),
+    sa.Column('tokens_used', sa.Integer(), nullable=True),
+    sa.Column('cost', sa.Float(), nullable=True),
+    sa.Column('user_rating', sa.Integer(), nullable=True),
+    sa.Column('user_feedback', sa.Text(), nullable=True),
+    sa.Column('was_helpful', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['cat_id'], ['cats.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ai_interactions_session_id'), 'ai_interactions', ['session_id'], unique=False)
+    op.create_table('health_records',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('cat_id', sa.UUID(), nullable=False),
+    sa.Column('record_type', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Float(), nullable=True),
+    sa.Column('unit', sa.String(length=20), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('appetite_level', sa.Integer(), nullable=True),
+    sa.Column('activity_level', sa.Integer(), nullable=True),
+    sa.Column('mood', sa.String(length=50), nullable=True),
+    sa.Column('energy_level', sa.Integer(), nullable=True),
+    sa.Column('weight', sa.Float(), nullable=True),
+    sa.Column('body_condition_score', sa.Integer(), nullable=True),
+    sa.Column('coat_condition', sa.String(length=50), nullable=True),
+    sa.Column('eye_condition', sa.String(length=50), nullable=True),
+    sa.Column('ear_condition', sa.String(length=50), nullable=True),
+    sa.Column('behavior_notes', sa.Text(), nullable=True),
+    sa.Column('unusual_behaviors', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('stress_indicators', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('ai_health_score', sa.Float(), nullable=True),
+    sa.Column('ai_risk_factors', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('ai_recommendations', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('anomaly_detected', sa.Boolean(), nullable=True),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('recorded_by', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['cat_id'], ['cats.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_health_cat_created', 'health_records', ['cat_id', 'created_at'], unique=False)
+    op.create_index('ix_health_cat_recorded', 'health_records', ['cat_id', 'recorded_at'], unique=False)
+    op.create_index('ix_health_cat_type_created', 'health_records', ['cat_id', 'record_type', 'created_at'], unique=False)
+    op.create_table('reminders',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('cat_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('type', sa.Enum('FOOD', 'WATER', 'PLAY', 'MEDICATION', 'VET_VISIT', 'GROOMING', name='catcaretype'), nullable=False),
+    sa.Column('frequency', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', 'CUSTOM', name='reminderfrequency'), nullable=True),
+    sa.Column('is_enabled', sa.Boolean(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=True),
+    sa.Column('estimated_duration', sa.Integer(), nullable=True),
+    sa.Column('ai_optimized', sa.Boolean(), nullable=True),
+    sa.Column('optimal_times', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('completion_rate', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_triggered', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['cat_id'], ['cats.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_reminders_cat_enabled', 'reminders', ['cat_id', 'is_enabled'], unique=False)
+    op.create_table('activity_records',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('reminder_id', sa.UUID(), nullable=False),
+    sa.Column('cat_id', sa.UUID(), nullable=False),
+    sa.Column('type', sa.Enum('FOOD', 'WATER', 'PLAY', 'MEDICATION', 'VET_VISIT', 'GROOMING', name='catcaretype'), nullable=False),
+    sa.Column('scheduled_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('complete_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'COMPLETED', 'SKIPPED', 'EXPIRED', 'CANCELLED', name='activitystatus'), nullable=True),
+    sa.Column('actual_duration', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('quality_rating', sa.Integer(), nullable=True),
+    sa.Column('cat_behavior', sa.String(length=100), nullable=True),
+    sa.Column('ai_analysis', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('anomaly_detected', sa.Boolean(), nullable=True),
+    sa.Column('health_indicators', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['cat_id'], ['cats.id'], ),
+    sa.ForeignKeyConstraint(['reminder_id'], ['reminders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_act_cat_sched', 'activity_records', ['cat_id', 'scheduled_time'], unique=False)
+    op.create_index('ix_activity_cat_created', 'activity_records', ['cat_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_activity_records_reminder_id'), 'activity_records', ['reminder_id'], unique=False)
+    op.create_index(op.f('ix_activity_records_status'), 'activity_records', ['status'], unique=False)
+    op.create_table('reminder_times',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('reminder_id', sa.UUID(), nullable=False),
+    sa.Column('hour', sa.Integer(), nullable=False),
+    sa.Column('minute', sa.Integer(), nullable=False),
+    sa.Column('day_of_week', sa.Integer(), nullable=True),
+    sa.Column('is_enabled', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['reminder_id'], ['reminders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ux_reminder_times_slot', 'reminder_times', ['reminder_id', 'hour', 'minute', 'day_of_week'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_reminder_times_slot', table_name='reminder_times')
+    op.drop_table('reminder_times')
+    op.drop_index(op.f('ix_activity_records_status'), table_name='activity_records')
+    op.drop_index(op.f('ix_activity_records_reminder_id'), table_name='activity_records')
+    op.drop_index('ix_activity_cat_created', table_name='activity_records')
+    op.drop_index('ix_act_cat_sched', table_name='activity_records')
+    op.drop_table('activity_records')
+    op.drop_index('ix_reminders_cat_enabled', table_name='reminders')
+    op.drop_table('reminders')
+    op.drop_index('ix_health_cat_type_created', table_name='health_records')
+    op.drop_index('ix_health_cat_recorded', table_name='health_records')
+    op.drop_index('ix_health_cat_created', table_name='health_records')
+    op.drop_table('health_records')
+    op.drop_index(op.f('ix_ai_interactions_session_id'), table_name='ai_interactions')
+    op.drop_table('ai_interactions')
+    op.drop_table('ai_insights')
+    op.drop_index('ix_cats_owner_active', table_name='cats', postgresql_where=sa.text('is_active'))
+    op.drop_table('cats')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    sa.Enum(name='activitystatus').drop(op.get_bind(), checkfirst=False)
+    sa.Enum(name='reminderfrequency').drop(op.get_bind(), checkfirst=False)
+    sa.Enum(name='catcaretype').drop(op.get_bind(), checkfirst=False)
@@ -0,0 +1,29 @@
+"""pending-activity, health BRIN indexes and cats.images check
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_act_pending_sched', 'activity_records', ['scheduled_time'], unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+    op.create_index('ix_health_created_brin', 'health_records', ['created_at'], unique=False, postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+    op.create_check_constraint('ck_cats_images_array', 'cats', "jsonb_typeof(images) = 'array'")
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_cats_images_array', 'cats', type_='check')
+    op.drop_index('ix_health_created_brin', table_name='health_records', postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+    op.drop_index('ix_act_pending_sched', table_name='activity_records', postgresql_where=sa.text("status = 'PENDING'"))
@@ -0,0 +1,42 @@
+"""cascade reminder and cat child deletes in the database
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table, ON DELETE action)
+FOREIGN_KEYS = [
+    ('reminder_times', 'reminder_id', 'reminders', 'CASCADE'),
+    ('activity_records', 'reminder_id', 'reminders', 'CASCADE'),
+    ('reminders', 'cat_id', 'cats', 'CASCADE'),
+    ('activity_records', 'cat_id', 'cats', 'CASCADE'),
+    ('health_records', 'cat_id', 'cats', 'CASCADE'),
+    ('ai_insights', 'cat_id', 'cats', 'CASCADE'),
+    ('ai_interactions', 'cat_id', 'cats', 'SET NULL'),
+]
+
+
+def _recreate(ondelete_for) -> None:
+    for table, column, referred, action in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete_for(action))
+
+
+def upgrade() -> None:
+    _recreate(lambda action: action)
+
+
+def downgrade() -> None:
+    _recreate(lambda action: None)
@@ -0,0 +1,55 @@
+"""store care type and frequency as checked VARCHAR values
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CARE_TYPES = ('food', 'water', 'play', 'medication', 'vet_visit', 'grooming')
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'custom')
+
+# (table, column, CHECK name, old PG enum type, allowed values)
+COLUMNS = [
+    ('reminders', 'type', 'ck_reminder_type', 'catcaretype', CARE_TYPES),
+    ('reminders', 'frequency', 'ck_reminder_frequency', 'reminderfrequency', FREQUENCIES),
+    ('activity_records', 'type', 'ck_activity_type', 'catcaretype', CARE_TYPES),
+]
+
+
+def _in_list(column: str, values) -> str:
+    return f"{column} IN ({', '.join(repr(value) for value in values)})"
+
+
+def upgrade() -> None:
+    # The PG enums stored member names ('FOOD'); the columns now hold the values ('food')
+    for table, column, check, _, values in COLUMNS:
+        op.alter_column(table, column, type_=sa.String(length=16), postgresql_using=f'lower({column}::text)')
+        op.create_check_constraint(check, table, _in_list(column, values))
+    
+    postgresql.ENUM(name='catcaretype').drop(op.get_bind())
+    postgresql.ENUM(name='reminderfrequency').drop(op.get_bind())
+
+
+def downgrade() -> None:
+    postgresql.ENUM(*(value.upper() for value in CARE_TYPES), name='catcaretype').create(op.get_bind())
+    postgresql.ENUM(*(value.upper() for value in FREQUENCIES), name='reminderfrequency').create(op.get_bind())
+    
+    for table, column, check, enum_type, _ in COLUMNS:
+        op.drop_constraint(check, table, type_='check')
+        op.alter_column(
+            table, column,
+            type_=postgresql.ENUM(name=enum_type, create_type=False),
+            postgresql_using=f'upper({column})::{enum_type}'
+        )
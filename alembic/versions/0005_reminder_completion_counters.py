@@ -0,0 +1,80 @@
+"""maintain reminder completion counters with a trigger
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reminders', sa.Column('scheduled_count', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('reminders', sa.Column('completed_count', sa.BigInteger(), server_default='0', nullable=False))
+    
+    # Hold off activity writes until the trigger and the backfill commit together
+    op.execute("LOCK TABLE activity_records IN SHARE MODE")
+    op.execute("""
+    CREATE OR REPLACE FUNCTION reminder_completion_counters() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.reminder_id = NEW.reminder_id THEN
+            UPDATE reminders SET completed_count = completed_count
+                + (NEW.status IS NOT DISTINCT FROM 'COMPLETED')::int
+                - (OLD.status IS NOT DISTINCT FROM 'COMPLETED')::int
+            WHERE id = NEW.reminder_id;
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE reminders SET scheduled_count = scheduled_count - 1,
+                completed_count = completed_count - (OLD.status IS NOT DISTINCT FROM 'COMPLETED')::int
+            WHERE id = OLD.reminder_id;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            UPDATE reminders SET scheduled_count = scheduled_count + 1,
+                completed_count = completed_count + (NEW.status IS NOT DISTINCT FROM 'COMPLETED')::int
+            WHERE id = NEW.reminder_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER activity_records_completion_counters
+    AFTER INSERT OR DELETE OR UPDATE OF status, reminder_id ON activity_records
+    FOR EACH ROW EXECUTE FUNCTION reminder_completion_counters()
+    """)
+    op.execute("""
+    UPDATE reminders SET scheduled_count = counts.scheduled, completed_count = counts.completed
+    FROM (
+        SELECT reminder_id,
+            count(*) AS scheduled,
+            count(*) FILTER (WHERE status = 'COMPLETED') AS completed
+        FROM activity_records
+        GROUP BY reminder_id
+    ) AS counts
+    WHERE reminders.id = counts.reminder_id
+    """)
+    
+    op.drop_column('reminders', 'completion_rate')
+
+
+def downgrade() -> None:
+    op.add_column('reminders', sa.Column('completion_rate', sa.Float(), nullable=True))
+    op.execute(
+        "UPDATE reminders SET completion_rate = "
+        "coalesce(completed_count::float / nullif(scheduled_count, 0), 0.0)"
+    )
+    
+    op.execute("DROP TRIGGER activity_records_completion_counters ON activity_records")
+    op.execute("DROP FUNCTION reminder_completion_counters()")
+    op.drop_column('reminders', 'completed_count')
+    op.drop_column('reminders', 'scheduled_count')
@@ -0,0 +1,37 @@
+"""make daily reminder slots collide in the unique slot index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15 09:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL day_of_week never conflicted, so daily slots may already be repeated
+    op.execute("""
+    DELETE FROM reminder_times AS dup
+    USING reminder_times AS kept
+    WHERE dup.reminder_id = kept.reminder_id
+        AND dup.hour = kept.hour
+        AND dup.minute = kept.minute
+        AND coalesce(dup.day_of_week, -1) = coalesce(kept.day_of_week, -1)
+        AND dup.id > kept.id
+    """)
+    op.drop_index('ux_reminder_times_slot', table_name='reminder_times')
+    op.create_index('ux_reminder_times_slot', 'reminder_times', ['reminder_id', 'hour', 'minute', sa.text('coalesce(day_of_week, -1)')], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_reminder_times_slot', table_name='reminder_times')
+    op.create_index('ux_reminder_times_slot', 'reminder_times', ['reminder_id', 'hour', 'minute', 'day_of_week'], unique=True)
@@ -1,55 +1,156 @@
 """
 Main AI Agent for CatAlert application
 """
-from typing import Dict, Any, List, Optional
-import json
+from typing import Dict, Any, List, Optional, AsyncIterator, Final
+from collections import OrderedDict
+import asyncio
+import hashlib
+import msgspec
+import numpy as np
+import orjson
+import re
 import uuid
 import structlog
 from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.ai.llm_service import LLMService
+from app.ai.context_cache import context_cache
+from app.ai.daily_stats import FEATURE_NAMES, compute_daily_features
+from app.ai.interaction_writer import interaction_writer
+from app.ai.llm_service import get_llm_service
 from app.ai.tools import CatCareTools
+from app.core.database import AsyncSessionLocal
 from app.core.exceptions import AIAgentError
-from app.models import AIInteraction, AIInsight
+from app.models import AIInteraction, AIInsight, ActivityRecord, ActivityStatus, HealthRecord
 
 logger = structlog.get_logger()
 
+REQUEST_TYPES = frozenset({
+    "simple_query",
+    "complex_analysis",
+    "reminder_management",
+    "health_consultation",
+    "general",
+})
+
+# Unambiguous keywords that route a request without asking the LLM
+_KEYWORD_RULES = (
+    (re.compile(r"提醒"), "reminder_management"),
+    (re.compile(r"兽医|生病|不舒服"), "health_consultation"),
+    (re.compile(r"分析|异常|趋势"), "complex_analysis"),
+)
+
+# LRU of LLM classification results keyed by input digest
+_CLASSIFICATION_CACHE_SIZE = 4096
+_classification_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# Cats per multi-cat insights prompt, and maximum concurrent prompts
+_INSIGHT_BATCH_SIZE = 20
+_INSIGHT_CONCURRENCY = 20
+
+
+SYSTEM_PROMPT: Final[str] = """你是CatAlert的智能猫咪护理助手，具有以下专业能力：
+
+1. 健康监测：分析猫咪的日常数据，识别健康异常和趋势
+2. 行为分析：理解猫咪的行为模式，提供个性化建议
+3. 提醒优化：根据猫咪和主人的习惯优化提醒时间
+4. 异常检测：识别异常行为模式并发出预警
+5. 个性化推荐：基于猫咪特点提供定制化护理建议
+
+你的工作原则：
+- 基于数据事实进行分析，避免主观臆测
+- 提供具体可操作的建议
+- 保持专业和友好的语调
+- 在不确定时建议咨询专业兽医
+- 优先考虑猫咪的健康和福祉
+
+你可以使用以下工具：
+- get_cat_data: 获取猫咪的详细数据
+- create_reminder: 创建新的护理提醒
+- analyze_health_trend: 分析健康趋势
+- get_recent_activities: 获取最近的活动记录
+- update_activity_status: 更新活动状态
+- create_health_record: 创建健康记录
+"""
+
+# Static instructions come first so the prompt prefix stays cacheable
+_SIMPLE_QUERY_TEMPLATE: Final[str] = """请基于数据回答用户问题，提供准确、简洁的回答。
+
+猫咪数据：
+{cat_json}
+
+用户问题：{question}
+"""
+
+# Canned replies for the structured handlers
+_COMPLEX_ANALYSIS_TEMPLATE: Final[str] = """基于数据分析，我为您提供以下洞察：
+
+📊 健康评分：{score:.1%}
+
+🔍 主要发现：
+{findings}
+
+⚠️ 风险因素：
+{risks}
+
+💡 建议：
+{recommendations}
+"""
+
+_REMINDER_TEMPLATE: Final[str] = """基于{name}的情况，我建议以下提醒设置：
+
+{suggestions}
+
+您希望我帮您创建这些提醒吗？
+"""
+
+_URGENT_HEALTH_TEMPLATE: Final[str] = """⚠️ 检测到以下需要关注的问题：
+
+{issues}
+
+建议您：
+1. 密切观察猫咪的行为变化
+2. 记录详细的症状和异常
+3. 尽快联系专业兽医进行咨询
+
+如果情况紧急，请立即联系24小时宠物医院。
+"""
+
+_HEALTHY_MESSAGE: Final[str] = """根据当前数据分析，您的猫咪健康状况良好。
+
+建议继续维持现有的护理计划，并定期观察猫咪的行为变化。
+如有任何异常情况，请及时咨询专业兽医。
+"""
+
+
+def _bullets(items) -> str:
+    """Render items as a bulleted list, one per line"""
+    return "\n".join("• " + str(item) for item in items)
+
+
+class AgentContext(msgspec.Struct, frozen=True, omit_defaults=True):
+    """Data gathered for one user turn and shared by the request handlers"""
+    cat_data: Dict[str, Any] = {}
+    recent_activities: Dict[str, Any] = {}
+    health_trends: Dict[str, Any] = {}
+    timestamp: str = ""
+    error: Optional[str] = None
+
+
+def _sse(event: Dict[str, Any]) -> bytes:
+    """Encode an event as a server-sent events frame"""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
 
 class CatAlertAgent:
     """Main AI Agent for CatAlert application"""
     
-    def __init__(self, db_session):
+    def __init__(self, db_session: AsyncSession):
         self.db = db_session
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
         self.tools = CatCareTools(db_session)
-        self.system_prompt = self._get_system_prompt()
-    
-    def _get_system_prompt(self) -> str:
-        """Get system prompt for the AI Agent"""
-        return """
-        你是CatAlert的智能猫咪护理助手，具有以下专业能力：
-        
-        1. 健康监测：分析猫咪的日常数据，识别健康异常和趋势
-        2. 行为分析：理解猫咪的行为模式，提供个性化建议
-        3. 提醒优化：根据猫咪和主人的习惯优化提醒时间
-        4. 异常检测：识别异常行为模式并发出预警
-        5. 个性化推荐：基于猫咪特点提供定制化护理建议
-        
-        你的工作原则：
-        - 基于数据事实进行分析，避免主观臆测
-        - 提供具体可操作的建议
-        - 保持专业和友好的语调
-        - 在不确定时建议咨询专业兽医
-        - 优先考虑猫咪的健康和福祉
-        
-        你可以使用以下工具：
-        - get_cat_data: 获取猫咪的详细数据
-        - create_reminder: 创建新的护理提醒
-        - analyze_health_trend: 分析健康趋势
-        - get_recent_activities: 获取最近的活动记录
-        - update_activity_status: 更新活动状态
-        - create_health_record: 创建健康记录
-        """
+        self.system_prompt = SYSTEM_PROMPT
     
     async def process_user_request(
         self,
@@ -73,22 +174,13 @@ class CatAlertAgent:
             context = await self._build_context(cat_id, user_input)
             
             # Process based on request type
-            if request_type == "simple_query":
-                response = await self._handle_simple_query(user_input, context, cat_id)
-            elif request_type == "complex_analysis":
-                response = await self._handle_complex_analysis(user_input, context, cat_id)
-            elif request_type == "reminder_management":
-                response = await self._handle_reminder_management(user_input, context, cat_id)
-            elif request_type == "health_consultation":
-                response = await self._handle_health_consultation(user_input, context, cat_id)
-            else:
-                response = await self._handle_general_query(user_input, context, cat_id)
+            response = await self._dispatch_request(request_type, user_input, context, cat_id)
             
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
             
             # Store interaction
-            await self._store_interaction(
+            self._store_interaction(
                 user_id=user_id,
                 cat_id=cat_id,
                 session_id=session_id,
@@ -117,8 +209,109 @@ class CatAlertAgent:
                 "type": "error"
             }
     
+    async def process_user_request_stream(
+        self,
+        user_id: str,
+        cat_id: str,
+        user_input: str,
+        session_id: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Process user request and stream the response as server-sent events"""
+        start_time = datetime.now()
+        
+        # Generate session ID if not provided
+        if not session_id:
+            session_id = str(uuid.uuid4())
+        
+        try:
+            request_type = await self._classify_request(user_input)
+            context = await self._build_context(cat_id, user_input)
+            
+            yield _sse({"type": "start", "session_id": session_id, "request_type": request_type})
+            
+            response: Dict[str, Any] = {}
+            if request_type in ("simple_query", "general"):
+                # Free-form answers are streamed token by token
+                if request_type == "simple_query":
+                    messages = self._simple_query_messages(user_input, context)
+                else:
+                    messages = self._general_query_messages(user_input)
+                
+                chunks = []
+                async for delta in self.llm_service.chat_completion_stream(messages):
+                    chunks.append(delta)
+                    yield _sse({"type": "delta", "content": delta})
+                message = "".join(chunks)
+            else:
+                # Structured handlers produce their message in one piece
+                response = await self._dispatch_request(request_type, user_input, context, cat_id)
+                message = response["message"]
+                yield _sse({"type": "delta", "content": message})
+            
+            processing_time = (datetime.now() - start_time).total_seconds() * 1000
+            
+            self._store_interaction(
+                user_id=user_id,
+                cat_id=cat_id,
+                session_id=session_id,
+                interaction_type=request_type,
+                user_input=user_input,
+                ai_response=message,
+                context=context,
+                processing_time_ms=int(processing_time)
+            )
+            
+            yield _sse({
+                "type": "done",
+                "processing_time_ms": int(processing_time),
+                "suggestions": response.get("suggestions", []),
+                "insights": response.get("insights", [])
+            })
+            
+        except Exception as e:
+            logger.error("Error streaming user request", error=str(e))
+            yield _sse({"type": "error", "message": f"处理请求时发生错误：{str(e)}"})
+    
+    async def _dispatch_request(
+        self,
+        request_type: str,
+        user_input: str,
+        context: AgentContext,
+        cat_id: str
+    ) -> Dict[str, Any]:
+        """Route a classified request to its handler"""
+        if request_type == "simple_query":
+            return await self._handle_simple_query(user_input, context, cat_id)
+        elif request_type == "complex_analysis":
+            return await self._handle_complex_analysis(user_input, context, cat_id)
+        elif request_type == "reminder_management":
+            return await self._handle_reminder_management(user_input, context, cat_id)
+        elif request_type == "health_consultation":
+            return await self._handle_health_consultation(user_input, context, cat_id)
+        else:
+            return await self._handle_general_query(user_input, context, cat_id)
+    
     async def _classify_request(self, user_input: str) -> str:
         """Classify the type of user request"""
+        for pattern, request_type in _KEYWORD_RULES:
+            if pattern.search(user_input):
+                return request_type
+        
+        key = hashlib.blake2b(user_input.encode(), digest_size=16).hexdigest()
+        cached = _classification_cache.get(key)
+        if cached is not None:
+            _classification_cache.move_to_end(key)
+            return cached
+        
+        request_type = await self._classify_with_llm(user_input)
+        if request_type in REQUEST_TYPES:
+            _classification_cache[key] = request_type
+            if len(_classification_cache) > _CLASSIFICATION_CACHE_SIZE:
+                _classification_cache.popitem(last=False)
+        return request_type
+    
+    async def _classify_with_llm(self, user_input: str) -> str:
+        """Ask the LLM to classify the user request"""
         classification_prompt = f"""
         将以下用户请求分类为以下类型之一：
         1. simple_query - 简单查询（如"今天喂了几次？"、"胡胡的体重是多少？"）
@@ -139,46 +332,46 @@ class CatAlertAgent:
         response = await self.llm_service.chat_completion(messages)
         return response["content"].strip().lower()
     
-    async def _build_context(self, cat_id: str, user_input: str) -> Dict[str, Any]:
+    async def _build_context(self, cat_id: str, user_input: str) -> AgentContext:
         """Build context for the request"""
+        # Writes invalidate with UUID objects; key by the canonical lowercase form
+        cached = context_cache.get(str(cat_id).lower())
+        if cached is not None:
+            return cached
+        
         try:
-            # Get cat data
-            cat_data = self.tools.get_cat_data(cat_id)
-            
-            # Get recent activities
-            recent_activities = self.tools.get_recent_activities(cat_id, days=7)
-            
-            # Get health trends
-            health_trends = self.tools.analyze_health_trend(cat_id, days=30)
+            # Fetch cat data, recent activities and health trends concurrently
+            cat_data, recent_activities, health_trends = await asyncio.gather(
+                self._run_tool("get_cat_data", cat_id),
+                self._run_tool("summarize_recent_activities", cat_id, days=7),
+                self._run_tool("analyze_health_trend", cat_id, days=30)
+            )
             
-            return {
-                "cat_data": cat_data,
-                "recent_activities": recent_activities,
-                "health_trends": health_trends,
-                "timestamp": datetime.now().isoformat()
-            }
+            context = AgentContext(
+                cat_data=cat_data,
+                recent_activities=recent_activities,
+                health_trends=health_trends,
+                timestamp=datetime.now().isoformat()
+            )
+            context_cache[str(cat_id).lower()] = context
+            return context
         except Exception as e:
             logger.warning("Failed to build context", error=str(e))
-            return {"error": str(e)}
+            return AgentContext(error=str(e))
+    
+    async def _run_tool(self, method: str, *args, **kwargs) -> Any:
+        """Run a read-only tool on its own DB session so calls can overlap"""
+        async with AsyncSessionLocal() as db:
+            return await getattr(CatCareTools(db), method)(*args, **kwargs)
     
     async def _handle_simple_query(
         self,
         user_input: str,
-        context: Dict[str, Any],
+        context: AgentContext,
         cat_id: str
     ) -> Dict[str, Any]:
         """Handle simple queries"""
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": f"""
-            用户问题：{user_input}
-            
-            猫咪数据：
-            {json.dumps(context.get('cat_data', {}), ensure_ascii=False, indent=2)}
-            
-            请基于数据回答用户问题，提供准确、简洁的回答。
-            """}
-        ]
+        messages = self._simple_query_messages(user_input, context)
         
         response = await self.llm_service.chat_completion(messages)
         
@@ -190,31 +383,23 @@ class CatAlertAgent:
     async def _handle_complex_analysis(
         self,
         user_input: str,
-        context: Dict[str, Any],
+        context: AgentContext,
         cat_id: str
     ) -> Dict[str, Any]:
         """Handle complex analysis requests"""
         # Use LLM to analyze the data
-        analysis = await self.llm_service.analyze_cat_behavior(context.get('cat_data', {}))
+        analysis = await self.llm_service.analyze_cat_behavior(context.cat_data)
         
         # Generate insights
         insights = await self._generate_insights(cat_id, analysis)
         
         # Format response
-        response_message = f"""
-        基于数据分析，我为您提供以下洞察：
-        
-        📊 健康评分：{analysis.get('health_score', 0.7):.1%}
-        
-        🔍 主要发现：
-        {chr(10).join([f"• {finding}" for finding in analysis.get('key_findings', [])])}
-        
-        ⚠️ 风险因素：
-        {chr(10).join([f"• {risk}" for risk in analysis.get('risk_factors', [])])}
-        
-        💡 建议：
-        {chr(10).join([f"• {rec}" for rec in analysis.get('recommendations', [])])}
-        """
+        response_message = _COMPLEX_ANALYSIS_TEMPLATE.format_map({
+            "score": analysis.get('health_score', 0.7),
+            "findings": _bullets(analysis.get('key_findings', ())),
+            "risks": _bullets(analysis.get('risk_factors', ())),
+            "recommendations": _bullets(analysis.get('recommendations', ()))
+        })
         
         return {
             "message": response_message,
@@ -226,12 +411,12 @@ class CatAlertAgent:
     async def _handle_reminder_management(
         self,
         user_input: str,
-        context: Dict[str, Any],
+        context: AgentContext,
         cat_id: str
     ) -> Dict[str, Any]:
         """Handle reminder management requests"""
         # Get current reminders
-        cat_data = context.get('cat_data', {})
+        cat_data = context.cat_data
         
         # Generate reminder suggestions
         suggestions = await self.llm_service.generate_reminder_suggestions(
@@ -239,13 +424,10 @@ class CatAlertAgent:
             {"available_times": "全天", "frequency_preference": "适中"}
         )
         
-        response_message = f"""
-        基于{cat_data.get('name', '您的猫咪')}的情况，我建议以下提醒设置：
-        
-        {chr(10).join([f"• {s['title']} - {s['reason']}" for s in suggestions])}
-        
-        您希望我帮您创建这些提醒吗？
-        """
+        response_message = _REMINDER_TEMPLATE.format_map({
+            "name": cat_data.get('name', '您的猫咪'),
+            "suggestions": _bullets(f"{s['title']} - {s['reason']}" for s in suggestions)
+        })
         
         return {
             "message": response_message,
@@ -256,13 +438,13 @@ class CatAlertAgent:
     async def _handle_health_consultation(
         self,
         user_input: str,
-        context: Dict[str, Any],
+        context: AgentContext,
         cat_id: str
     ) -> Dict[str, Any]:
         """Handle health consultation requests"""
         # Analyze for potential health issues
-        cat_data = context.get('cat_data', {})
-        health_trends = context.get('health_trends', {})
+        cat_data = context.cat_data
+        health_trends = context.health_trends
         
         # Check for urgent issues
         urgent_issues = []
@@ -273,25 +455,9 @@ class CatAlertAgent:
             urgent_issues.append("体重持续下降，建议尽快咨询兽医")
         
         if urgent_issues:
-            response_message = f"""
-            ⚠️ 检测到以下需要关注的问题：
-            
-            {chr(10).join([f"• {issue}" for issue in urgent_issues])}
-            
-            建议您：
-            1. 密切观察猫咪的行为变化
-            2. 记录详细的症状和异常
-            3. 尽快联系专业兽医进行咨询
-            
-            如果情况紧急，请立即联系24小时宠物医院。
-            """
+            response_message = _URGENT_HEALTH_TEMPLATE.format_map({"issues": _bullets(urgent_issues)})
         else:
-            response_message = """
-            根据当前数据分析，您的猫咪健康状况良好。
-            
-            建议继续维持现有的护理计划，并定期观察猫咪的行为变化。
-            如有任何异常情况，请及时咨询专业兽医。
-            """
+            response_message = _HEALTHY_MESSAGE
         
         return {
             "message": response_message,
@@ -302,14 +468,11 @@ class CatAlertAgent:
     async def _handle_general_query(
         self,
         user_input: str,
-        context: Dict[str, Any],
+        context: AgentContext,
         cat_id: str
     ) -> Dict[str, Any]:
         """Handle general queries"""
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": user_input}
-        ]
+        messages = self._general_query_messages(user_input)
         
         response = await self.llm_service.chat_completion(messages)
         
@@ -318,6 +481,23 @@ class CatAlertAgent:
             "type": "general"
         }
     
+    def _simple_query_messages(self, user_input: str, context: AgentContext) -> List[Dict[str, str]]:
+        """Build messages for a simple query"""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": _SIMPLE_QUERY_TEMPLATE.format_map({
+                "question": user_input,
+                "cat_json": msgspec.json.encode(context.cat_data).decode()
+            })}
+        ]
+    
+    def _general_query_messages(self, user_input: str) -> List[Dict[str, str]]:
+        """Build messages for a general query"""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_input}
+        ]
+    
     async def _generate_insights(self, cat_id: str, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate AI insights based on analysis"""
         insights = []
@@ -346,7 +526,7 @@ class CatAlertAgent:
         
         return insights
     
-    async def _store_interaction(
+    def _store_interaction(
         self,
         user_id: str,
         cat_id: str,
@@ -354,37 +534,32 @@ class CatAlertAgent:
         interaction_type: str,
         user_input: str,
         ai_response: str,
-        context: Dict[str, Any],
+        context: AgentContext,
         processing_time_ms: int
     ):
-        """Store AI interaction in database"""
+        """Queue AI interaction for batched storage in the background"""
         try:
-            interaction = AIInteraction(
+            interaction_writer.submit(
                 user_id=user_id,
                 cat_id=cat_id,
                 session_id=session_id,
                 interaction_type=interaction_type,
                 user_input=user_input,
                 ai_response=ai_response,
-                context=context,
+                context=msgspec.to_builtins(context),
                 processing_time_ms=processing_time_ms,
                 model_used=self.llm_service.model
             )
-            
-            self.db.add(interaction)
-            self.db.commit()
-            
         except Exception as e:
-            logger.error("Failed to store interaction", error=str(e))
-            self.db.rollback()
+            logger.error("Failed to queue interaction", error=str(e))
     
     async def generate_daily_insights(self, cat_id: str) -> List[Dict[str, Any]]:
         """Generate daily insights for a cat"""
         try:
             # Get cat data and recent activities
-            cat_data = self.tools.get_cat_data(cat_id)
-            recent_activities = self.tools.get_recent_activities(cat_id, days=1)
-            health_trends = self.tools.analyze_health_trend(cat_id, days=7)
+            cat_data = await self.tools.get_cat_data(cat_id)
+            recent_activities = await self.tools.summarize_recent_activities(cat_id, days=1)
+            health_trends = await self.tools.analyze_health_trend(cat_id, days=7)
             
             # Generate insights using LLM
             insights_data = await self.llm_service.generate_health_insights(
@@ -398,25 +573,100 @@ class CatAlertAgent:
             # Create insight records
             insights = []
             for insight_data in insights_data.get('recommendations', []):
-                insight = AIInsight(
-                    cat_id=cat_id,
-                    insight_type="daily",
-                    title=insight_data.get('title', '每日洞察'),
-                    description=insight_data.get('description', ''),
-                    confidence_score=insight_data.get('confidence', 0.8),
-                    analysis_period="1d",
-                    recommendations=insight_data.get('actions', []),
-                    priority=insight_data.get('priority', 'medium'),
-                    expires_at=datetime.now() + timedelta(days=1)
-                )
+                insight = self._build_daily_insight(cat_id, insight_data)
                 
                 self.db.add(insight)
                 insights.append(insight)
             
-            self.db.commit()
+            await self.db.commit()
             return insights
             
         except Exception as e:
             logger.error("Failed to generate daily insights", cat_id=cat_id, error=str(e))
-            self.db.rollback()
+            await self.db.rollback()
             return []
+    
+    async def generate_daily_insights_batch(self, cat_ids: List[str]) -> List[AIInsight]:
+        """Generate daily insights for many cats in one pass"""
+        try:
+            now = datetime.now()
+            index = {str(cat_id): i for i, cat_id in enumerate(cat_ids)}
+            
+            # Load the raw columns for every cat with one query per table
+            result = await self.db.execute(
+                select(HealthRecord.cat_id, HealthRecord.value).where(
+                    HealthRecord.cat_id.in_(cat_ids),
+                    HealthRecord.record_type == "weight",
+                    HealthRecord.value.isnot(None),
+                    HealthRecord.created_at >= now - timedelta(days=7)
+                )
+            )
+            weight_rows = result.all()
+            
+            result = await self.db.execute(
+                select(ActivityRecord.cat_id, ActivityRecord.actual_duration, ActivityRecord.status).where(
+                    ActivityRecord.cat_id.in_(cat_ids),
+                    ActivityRecord.created_at >= now - timedelta(days=1)
+                )
+            )
+            activity_rows = result.all()
+            
+            features = compute_daily_features(
+                len(cat_ids),
+                np.fromiter((index[str(r.cat_id)] for r in weight_rows), dtype=np.intp, count=len(weight_rows)),
+                np.fromiter((r.value for r in weight_rows), dtype=np.float64, count=len(weight_rows)),
+                np.fromiter((index[str(r.cat_id)] for r in activity_rows), dtype=np.intp, count=len(activity_rows)),
+                np.fromiter((r.actual_duration or 0 for r in activity_rows), dtype=np.float64, count=len(activity_rows)),
+                np.fromiter((r.status == ActivityStatus.COMPLETED for r in activity_rows), dtype=np.float64, count=len(activity_rows))
+            )
+            
+            # One prompt per chunk of cats, with the chunks fanned out under a cap
+            stats = {
+                str(cat_id): dict(zip(FEATURE_NAMES, np.round(features[i], 2).tolist()))
+                for i, cat_id in enumerate(cat_ids)
+            }
+            keys = list(stats)
+            chunks = [keys[start:start + _INSIGHT_BATCH_SIZE] for start in range(0, len(keys), _INSIGHT_BATCH_SIZE)]
+            semaphore = asyncio.Semaphore(_INSIGHT_CONCURRENCY)
+            
+            async def _insights_for(chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+                async with semaphore:
+                    return await self.llm_service.generate_batch_health_insights(
+                        {cat_id: stats[cat_id] for cat_id in chunk}, "1d"
+                    )
+            
+            results = await asyncio.gather(*(_insights_for(chunk) for chunk in chunks), return_exceptions=True)
+            
+            # Create insight records
+            insights = []
+            for chunk, chunk_data in zip(chunks, results):
+                if isinstance(chunk_data, Exception):
+                    logger.warning("Failed to generate daily insights", cat_count=len(chunk), error=str(chunk_data))
+                    continue
+                for cat_id in chunk:
+                    for insight_data in chunk_data.get(cat_id, {}).get('recommendations', []):
+                        insights.append(self._build_daily_insight(cat_id, insight_data))
+            
+            self.db.add_all(insights)
+            await self.db.commit()
+            return insights
+            
+        except Exception as e:
+            logger.error("Failed to generate daily insights batch", cat_count=len(cat_ids), error=str(e))
+            await self.db.rollback()
+            return []
+    
+    def _build_daily_insight(self, cat_id: str, insight_data: Dict[str, Any]) -> AIInsight:
+        """Build a daily insight record from LLM output"""
+        return AIInsight(
+            cat_id=cat_id,
+            insight_type="daily",
+            title=insight_data.get('title', '每日洞察'),
+            description=insight_data.get('description', ''),
+            confidence_score=insight_data.get('confidence', 0.8),
+            analysis_period="1d",
+            recommendations=insight_data.get('actions', []),
+            priority=insight_data.get('priority', 'medium'),
+            generated_at=datetime.now(),
+            expires_at=datetime.now() + timedelta(days=1)
+        )
@@ -0,0 +1,21 @@
+"""
+Short-lived per-cat cache for agent context
+"""
+from typing import Any
+from cachetools import TTLCache
+
+from app.ai.semantic_cache import response_cache
+from app.core.http_cache import invalidate_cat
+
+# Messages within one chat session arrive seconds apart, so the cat's
+# 7-day stats are reused for a short window instead of re-queried
+CONTEXT_TTL_SECONDS = 30
+
+context_cache: "TTLCache[str, Any]" = TTLCache(maxsize=10_000, ttl=CONTEXT_TTL_SECONDS)
+
+
+def invalidate_context(cat_id: Any):
+    """Drop the cached context after a write that changes the cat's records"""
+    context_cache.pop(str(cat_id).lower(), None)
+    response_cache.invalidate(cat_id)
+    invalidate_cat(cat_id)
@@ -0,0 +1,40 @@
+"""
+Vectorized per-cat statistics for batched daily insights
+"""
+from typing import Tuple
+import numpy as np
+
+FEATURE_NAMES: Tuple[str, ...] = (
+    "mean_weight",
+    "activity_minutes",
+    "completion_rate",
+    "activity_count",
+)
+
+
+def compute_daily_features(
+    n_cats: int,
+    weight_idx: np.ndarray,
+    weights: np.ndarray,
+    activity_idx: np.ndarray,
+    durations: np.ndarray,
+    completed: np.ndarray
+) -> np.ndarray:
+    """Reduce flat per-row arrays into an (n_cats, len(FEATURE_NAMES)) matrix
+    
+    ``weight_idx`` and ``activity_idx`` give the position of each row's cat,
+    so every feature is a single segmented reduction over all cats at once.
+    """
+    weight_counts = np.bincount(weight_idx, minlength=n_cats)
+    weight_sums = np.bincount(weight_idx, weights=weights, minlength=n_cats)
+    activity_counts = np.bincount(activity_idx, minlength=n_cats)
+    minutes = np.bincount(activity_idx, weights=durations, minlength=n_cats)
+    completed_counts = np.bincount(activity_idx, weights=completed, minlength=n_cats)
+    
+    features = np.zeros((n_cats, len(FEATURE_NAMES)), dtype=np.float64)
+    np.divide(weight_sums, weight_counts, out=features[:, 0], where=weight_counts > 0)
+    features[:, 1] = minutes
+    np.divide(completed_counts, activity_counts, out=features[:, 2], where=activity_counts > 0)
+    features[:, 3] = activity_counts
+    
+    return features
@@ -0,0 +1,83 @@
+"""
+Batched background writer for AI interactions
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import structlog
+from sqlalchemy import insert
+
+from app.core.database import AsyncSessionLocal
+from app.models import AIInteraction
+
+logger = structlog.get_logger()
+
+_STOP = object()
+
+
+class InteractionWriter:
+    """Persists AI interactions off the request path in batches"""
+    
+    def __init__(self, batch_size: int = 64, flush_interval: float = 0.2):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def submit(self, **fields: Any):
+        """Queue an interaction for storage without waiting for the database"""
+        if self._task is None or self._task.done():
+            self.start()
+        self._queue.put_nowait(fields)
+    
+    def start(self):
+        """Start the consumer task on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Flush pending interactions and stop the consumer task"""
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+    
+    async def _run(self):
+        """Drain the queue, committing up to batch_size rows per flush_interval"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await self._flush(batch)
+    
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        """Insert a batch of interactions in a single transaction"""
+        try:
+            async with AsyncSessionLocal() as session:
+                # ORM bulk INSERT: one multi-row statement, no per-row objects or RETURNING
+                await session.execute(insert(AIInteraction), batch)
+                await session.commit()
+        except Exception as e:
+            logger.error("Failed to store interactions", count=len(batch), error=str(e))
+
+
+interaction_writer = InteractionWriter()
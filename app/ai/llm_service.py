@@ -1,9 +1,14 @@
 """
 LLM Service for CatAlert AI Agent
 """
+import asyncio
+import hashlib
 import openai
-from typing import List, Dict, Any, Optional
-import json
+import httpx
+from functools import lru_cache
+from typing import List, Dict, Any, Final, Optional, AsyncIterator
+import numpy as np
+import orjson
 import time
 import structlog
 
@@ -12,21 +17,168 @@ from app.core.exceptions import AIAgentError, ExternalServiceError
 
 logger = structlog.get_logger()
 
+# Structured calls ask for short field names to cut output tokens
+_JSON_MODE = {"type": "json_object"}
+_SHORT_KEYS = {
+    "hs": "health_score",
+    "kf": "key_findings",
+    "rf": "risk_factors",
+    "rec": "recommendations",
+    "vet": "requires_vet_consultation",
+    "sug": "suggestions",
+    "ti": "title",
+    "ty": "type",
+    "st": "suggested_times",
+    "fr": "frequency",
+    "rs": "reason",
+    "an": "anomalies",
+    "sv": "severity",
+    "ds": "description",
+    "sa": "suggested_action",
+    "tr": "trends",
+    "km": "key_metrics",
+    "na": "next_actions",
+    "cf": "confidence",
+    "ac": "actions",
+    "pr": "priority",
+}
+
+
+# Caps in-flight OpenAI requests per process to stay inside rate limits
+_llm_slots = asyncio.Semaphore(settings.AI_AGENT_MAX_CONCURRENCY)
+
+
+# Per-call system prompts hold every static instruction so the request prefix
+# is identical across cats and stays eligible for provider prompt caching;
+# only the data goes into the user message
+_BEHAVIOR_ANALYSIS_PROMPT: Final[str] = """你是一位专业的猫咪健康顾问，具有10年兽医经验。
+请分析用户提供的猫咪数据并提供专业建议，从以下角度进行分析：
+1. 整体健康状况评估
+2. 行为模式分析
+3. 潜在健康风险识别
+4. 具体改进建议
+5. 是否需要兽医咨询
+
+以最简JSON返回，字段名使用短名：hs(健康评分0-1)、kf(主要发现)、rf(风险因素)、rec(建议)、vet(是否需要兽医,布尔)。每条不超过30字。
+"""
+
+_REMINDER_SUGGESTIONS_PROMPT: Final[str] = """你是猫咪护理专家，擅长制定个性化的护理计划。
+请基于用户提供的信息，为猫咪生成3-5个具体的提醒建议，包括：
+1. 提醒类型（喂食、换水、玩耍等）
+2. 建议时间
+3. 频率
+4. 理由说明
+
+以最简JSON返回：{"sug": [...]}，每个建议使用短字段名 ti(标题)、ty(类型)、st(建议时间数组)、fr(频率)、rs(理由,不超过20字)。
+"""
+
+_ANOMALY_DETECTION_PROMPT: Final[str] = """你是数据分析专家，擅长识别宠物行为中的异常模式。
+请分析用户提供的猫咪活动数据，识别以下类型的异常：
+1. 时间模式异常（如喂食时间突然改变）
+2. 频率异常（如活动频率显著下降）
+3. 行为异常（如完成率突然下降）
+4. 健康相关异常（如食欲不振、活动减少）
+
+以最简JSON返回：{"an": [...]}，每个异常使用短字段名 ty(类型)、sv(严重程度)、ds(描述)、sa(建议措施)，描述不超过30字。
+"""
+
+_HEALTH_INSIGHTS_PROMPT: Final[str] = """你是专业的宠物健康分析师，擅长解读健康数据并提供专业建议。
+请基于用户提供的健康数据生成洞察报告，包含以下内容：
+1. 健康趋势分析
+2. 关键指标变化
+3. 风险因素识别
+4. 改进建议
+5. 下一步行动建议
+
+以最简JSON返回，字段名使用短名：tr(趋势)、km(关键指标)、rf(风险因素)、rec(建议数组)、na(下一步行动)。
+rec中每项包含 ti(标题)、ds(描述,不超过40字)、cf(置信度0-1)、ac(行动数组)、pr(优先级 low/medium/high)。
+"""
+
+_BATCH_HEALTH_INSIGHTS_PROMPT: Final[str] = """你是专业的宠物健康分析师，擅长解读健康数据并提供专业建议。
+请基于用户提供的统计数据，为其中每只猫咪生成健康洞察。
+
+以最简JSON返回：{"cats": {"<id>": {"rec": [...]}}}，每只猫咪最多2条建议。
+rec中每项包含 ti(标题)、ds(描述,不超过30字)、cf(置信度0-1)、ac(行动数组)、pr(优先级 low/medium/high)。
+"""
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize prompt context to indented JSON"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _expand_keys(obj: Any) -> Any:
+    """Map short field names in LLM JSON output back to their long names"""
+    if isinstance(obj, dict):
+        return {_SHORT_KEYS.get(k, k): _expand_keys(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_expand_keys(v) for v in obj]
+    return obj
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> openai.AsyncOpenAI:
+    """Get the process-wide OpenAI client and its connection pool"""
+    return openai.AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=3.0),
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=60
+            )
+        )
+    )
+
 
 class LLMService:
     """Large Language Model service for AI Agent"""
     
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_client()
         self.model = settings.AI_AGENT_MODEL
         self.max_tokens = settings.AI_AGENT_MAX_TOKENS
         self.temperature = settings.AI_AGENT_TEMPERATURE
+        # Identical completion requests in flight, keyed by a digest of the payload
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
     
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         tools: Optional[List[Dict]] = None,
-        tool_choice: str = "auto"
+        tool_choice: str = "auto",
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Perform chat completion, sharing one API call among identical concurrent requests"""
+        key = hashlib.blake2b(
+            orjson.dumps(
+                [messages, tools, tool_choice, max_tokens, response_format],
+                option=orjson.OPT_SORT_KEYS
+            ),
+            digest_size=16
+        ).hexdigest()
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._create_completion(messages, tools, tool_choice, max_tokens, response_format)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one caller being cancelled does not cancel the shared call
+        return await asyncio.shield(task)
+    
+    async def _create_completion(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]],
+        tool_choice: str,
+        max_tokens: Optional[int],
+        response_format: Optional[Dict[str, str]]
     ) -> Dict[str, Any]:
         """Perform chat completion with optional tool calling"""
         try:
@@ -36,17 +188,21 @@ class LLMService:
             request_params = {
                 "model": self.model,
                 "messages": messages,
-                "max_tokens": self.max_tokens,
+                "max_tokens": max_tokens or self.max_tokens,
                 "temperature": self.temperature,
             }
             
+            if response_format:
+                request_params["response_format"] = response_format
+            
             # Add tools if provided
             if tools:
                 request_params["tools"] = tools
                 request_params["tool_choice"] = tool_choice
             
             # Make API call
-            response = self.client.chat.completions.create(**request_params)
+            async with _llm_slots:
+                response = await self.client.chat.completions.create(**request_params)
             
             # Calculate processing time
             processing_time = (time.time() - start_time) * 1000
@@ -82,11 +238,56 @@ class LLMService:
             logger.error("LLM service error", error=str(e))
             raise AIAgentError(f"LLM service error: {str(e)}")
     
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Perform chat completion, yielding content deltas as they arrive"""
+        try:
+            async with _llm_slots:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    stream=True
+                )
+                
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            
+        except openai.APIError as e:
+            logger.error("OpenAI API error", error=str(e))
+            raise ExternalServiceError("OpenAI", str(e))
+        except Exception as e:
+            logger.error("LLM streaming error", error=str(e))
+            raise AIAgentError(f"LLM service error: {str(e)}")
+    
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed text as a unit-norm float32 vector"""
+        try:
+            async with _llm_slots:
+                response = await self.client.embeddings.create(
+                    model=settings.EMBEDDING_MODEL,
+                    input=text
+                )
+            vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+            return vector / np.linalg.norm(vector)
+            
+        except openai.APIError as e:
+            logger.error("OpenAI API error", error=str(e))
+            raise ExternalServiceError("OpenAI", str(e))
+        except Exception as e:
+            logger.error("Embedding error", error=str(e))
+            raise AIAgentError(f"LLM service error: {str(e)}")
+    
     async def analyze_cat_behavior(self, cat_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze cat behavior data using LLM"""
         prompt = f"""
-        作为专业的猫咪健康顾问，请分析以下猫咪数据并提供专业建议：
-        
         猫咪基本信息：
         - 姓名：{cat_data.get('name', '未知')}
         - 年龄：{cat_data.get('age', '未知')}岁
@@ -98,29 +299,20 @@ class LLMService:
         - 平均活动时长：{cat_data.get('avg_activity_duration', 0)}分钟/天
         - 任务完成率：{cat_data.get('completion_rate', 0):.1%}
         - 异常行为次数：{cat_data.get('anomaly_count', 0)}次
-        
-        请从以下角度进行分析：
-        1. 整体健康状况评估
-        2. 行为模式分析
-        3. 潜在健康风险识别
-        4. 具体改进建议
-        5. 是否需要兽医咨询
-        
-        请以JSON格式返回分析结果，包含health_score(0-1)、risk_factors、recommendations等字段。
         """
         
         messages = [
-            {"role": "system", "content": "你是一位专业的猫咪健康顾问，具有10年兽医经验。"},
+            {"role": "system", "content": _BEHAVIOR_ANALYSIS_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        response = await self.chat_completion(messages)
+        response = await self.chat_completion(messages, max_tokens=500, response_format=_JSON_MODE)
         
         try:
             # Parse JSON response
-            analysis = json.loads(response["content"])
+            analysis = _expand_keys(orjson.loads(response["content"]))
             return analysis
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Fallback if JSON parsing fails
             return {
                 "health_score": 0.7,
@@ -136,8 +328,6 @@ class LLMService:
     ) -> List[Dict[str, Any]]:
         """Generate personalized reminder suggestions"""
         prompt = f"""
-        基于以下信息，为猫咪生成个性化的护理提醒建议：
-        
         猫咪信息：
         - 年龄：{cat_data.get('age', '未知')}岁
         - 品种：{cat_data.get('breed', '未知')}
@@ -147,57 +337,39 @@ class LLMService:
         - 可用时间：{user_preferences.get('available_times', '全天')}
         - 提醒频率偏好：{user_preferences.get('frequency_preference', '适中')}
         - 特殊需求：{user_preferences.get('special_needs', '无')}
-        
-        请生成3-5个具体的提醒建议，包括：
-        1. 提醒类型（喂食、换水、玩耍等）
-        2. 建议时间
-        3. 频率
-        4. 理由说明
-        
-        以JSON数组格式返回，每个建议包含title、type、suggested_times、frequency、reason字段。
         """
         
         messages = [
-            {"role": "system", "content": "你是猫咪护理专家，擅长制定个性化的护理计划。"},
+            {"role": "system", "content": _REMINDER_SUGGESTIONS_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        response = await self.chat_completion(messages)
+        response = await self.chat_completion(messages, max_tokens=400, response_format=_JSON_MODE)
         
         try:
-            suggestions = json.loads(response["content"])
-            return suggestions
-        except json.JSONDecodeError:
+            suggestions = _expand_keys(orjson.loads(response["content"]))
+            return suggestions.get("suggestions", [])
+        except orjson.JSONDecodeError:
             return []
     
     async def detect_anomalies(self, activity_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect anomalies in cat activity data"""
         prompt = f"""
-        分析以下猫咪活动数据，识别异常模式：
-        
         活动数据：
-        {json.dumps(activity_data, ensure_ascii=False, indent=2)}
-        
-        请识别以下类型的异常：
-        1. 时间模式异常（如喂食时间突然改变）
-        2. 频率异常（如活动频率显著下降）
-        3. 行为异常（如完成率突然下降）
-        4. 健康相关异常（如食欲不振、活动减少）
-        
-        以JSON格式返回异常检测结果，包含anomalies数组，每个异常包含type、severity、description、suggested_action字段。
+        {_dumps(activity_data)}
         """
         
         messages = [
-            {"role": "system", "content": "你是数据分析专家，擅长识别宠物行为中的异常模式。"},
+            {"role": "system", "content": _ANOMALY_DETECTION_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        response = await self.chat_completion(messages)
+        response = await self.chat_completion(messages, max_tokens=500, response_format=_JSON_MODE)
         
         try:
-            result = json.loads(response["content"])
+            result = _expand_keys(orjson.loads(response["content"]))
             return result.get("anomalies", [])
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return []
     
     async def generate_health_insights(
@@ -208,32 +380,21 @@ class LLMService:
     ) -> Dict[str, Any]:
         """Generate health insights for a cat"""
         prompt = f"""
-        基于{time_period}的健康数据，为猫咪生成健康洞察报告：
-        
-        健康数据：
-        {json.dumps(health_data, ensure_ascii=False, indent=2)}
-        
-        请生成包含以下内容的洞察报告：
-        1. 健康趋势分析
-        2. 关键指标变化
-        3. 风险因素识别
-        4. 改进建议
-        5. 下一步行动建议
-        
-        以JSON格式返回，包含trends、key_metrics、risk_factors、recommendations、next_actions字段。
+        {time_period}健康数据：
+        {_dumps(health_data)}
         """
         
         messages = [
-            {"role": "system", "content": "你是专业的宠物健康分析师，擅长解读健康数据并提供专业建议。"},
+            {"role": "system", "content": _HEALTH_INSIGHTS_PROMPT},
             {"role": "user", "content": prompt}
         ]
         
-        response = await self.chat_completion(messages)
+        response = await self.chat_completion(messages, max_tokens=600, response_format=_JSON_MODE)
         
         try:
-            insights = json.loads(response["content"])
+            insights = _expand_keys(orjson.loads(response["content"]))
             return insights
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return {
                 "trends": [],
                 "key_metrics": {},
@@ -241,3 +402,38 @@ class LLMService:
                 "recommendations": [],
                 "next_actions": []
             }
+    
+    async def generate_batch_health_insights(
+        self,
+        cat_stats: Dict[str, Dict[str, Any]],
+        time_period: str = "1d"
+    ) -> Dict[str, Dict[str, Any]]:
+        """Generate health insights for several cats with a single LLM call"""
+        cats = [{"id": cat_id, "stats": stats} for cat_id, stats in cat_stats.items()]
+        prompt = f"""
+        {time_period}统计数据：
+        {orjson.dumps(cats).decode()}
+        """
+        
+        messages = [
+            {"role": "system", "content": _BATCH_HEALTH_INSIGHTS_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        
+        response = await self.chat_completion(
+            messages,
+            max_tokens=min(4000, 200 * len(cats)),
+            response_format=_JSON_MODE
+        )
+        
+        try:
+            result = _expand_keys(orjson.loads(response["content"]))
+            return result.get("cats", {})
+        except orjson.JSONDecodeError:
+            return {}
+
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """Dependency to get the shared LLM service"""
+    return LLMService()
@@ -0,0 +1,70 @@
+"""
+Per-cat semantic cache for chat responses
+"""
+from typing import Any, Dict, Optional
+import time
+import numpy as np
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+# Cached answers embed the cat's recent stats, so they expire after a few
+# minutes even without a write that invalidates them
+RESPONSE_TTL_SECONDS = 300
+_MAX_ENTRIES_PER_CAT = 64
+
+
+def _key(cat_id: Any) -> str:
+    """Cache key for a cat; clients may send the UUID in any case"""
+    return str(cat_id).lower()
+
+
+class SemanticCache:
+    """Cosine-similarity lookup of prior chat responses, scoped per cat"""
+    
+    def __init__(self, threshold: float, maxsize: int = 10_000, ttl: int = RESPONSE_TTL_SECONDS):
+        self.threshold = threshold
+        self.ttl = ttl
+        # cat_id -> (unit-norm embedding matrix, responses and insertion times in
+        # the same row order). Every put re-arms the cat's TTLCache entry, so each
+        # row also carries its own timestamp.
+        self._entries: "TTLCache[str, Any]" = TTLCache(maxsize=maxsize, ttl=ttl)
+    
+    def get(self, cat_id: Any, embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Return the closest fresh cached response if it clears the similarity threshold"""
+        entries = self._entries.get(_key(cat_id))
+        if entries is None:
+            return None
+        
+        keys, responses, stored_at = entries
+        scores = np.where(stored_at > time.monotonic() - self.ttl, keys @ embedding, -np.inf)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return responses[best]
+    
+    def put(self, cat_id: Any, embedding: np.ndarray, response: Dict[str, Any]):
+        """Remember a response, dropping expired rows and the oldest beyond the per-cat cap"""
+        key = _key(cat_id)
+        now = time.monotonic()
+        entries = self._entries.get(key)
+        if entries is None:
+            self._entries[key] = (embedding[np.newaxis, :], [response], np.array([now]))
+            return
+        
+        keys, responses, stored_at = entries
+        # Rows are in insertion order, so the fresh ones are a suffix
+        fresh = int(np.searchsorted(stored_at, now - self.ttl, side="right"))
+        start = max(fresh, len(responses) - (_MAX_ENTRIES_PER_CAT - 1))
+        self._entries[key] = (
+            np.vstack((keys[start:], embedding)),
+            responses[start:] + [response],
+            np.append(stored_at[start:], now)
+        )
+    
+    def invalidate(self, cat_id: Any):
+        """Drop every cached response for a cat"""
+        self._entries.pop(_key(cat_id), None)
+
+
+response_cache = SemanticCache(settings.SEMANTIC_CACHE_THRESHOLD)
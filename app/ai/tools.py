@@ -1,63 +1,152 @@
 """
 AI Agent Tools for CatAlert application
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, NamedTuple
+from collections import Counter
 import json
+import numpy as np
 import structlog
 from datetime import datetime, timedelta
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.ai.context_cache import invalidate_context
 from app.core.exceptions import AIAgentError
-from app.models import Cat, Reminder, ActivityRecord, HealthRecord
+from app.models import Cat, Reminder, ReminderTime, ActivityRecord, ActivityStatus, CatCareType, HealthRecord, ReminderFrequency
 
 logger = structlog.get_logger()
 
+# Enum member -> serialized value, resolved once instead of per row
+TYPE_STR = {m: m.value for m in CatCareType}
+STATUS_STR = {m: m.value for m in ActivityStatus}
+
+# Serialized value -> enum member, for coercing tool arguments
+_CARE_TYPES = CatCareType._value2member_map_
+_ACTIVITY_STATUSES = ActivityStatus._value2member_map_
+_FREQUENCIES = ReminderFrequency._value2member_map_
+
+
+def _enum_member(members, value: str, field: str):
+    """Coerce a tool argument to its enum member"""
+    try:
+        return members[value]
+    except KeyError:
+        raise AIAgentError(f"Invalid {field}: {value}")
+
+
+class TrendStats(NamedTuple):
+    """Numeric summary of a cat's records over an analysis window"""
+    mean_weight: float
+    weight_slope: float  # kg per day
+    completion_rate: float
+    anomaly_count: int
+
+
+def _trend_stats(
+    timestamps: np.ndarray,
+    weights: np.ndarray,
+    completed: np.ndarray,
+    anomalies: np.ndarray
+) -> TrendStats:
+    """Reduce weight series and activity flags with vectorized NumPy ops"""
+    mean_weight = float(weights.mean()) if weights.size else 0.0
+    
+    weight_slope = 0.0
+    if weights.size >= 2:
+        days = (timestamps - timestamps[0]) / 86400.0
+        x = days - days.mean()
+        denom = float(np.dot(x, x))
+        if denom > 0:
+            weight_slope = float(np.dot(x, weights - mean_weight)) / denom
+    
+    completion_rate = float(completed.mean()) if completed.size else 0.0
+    anomaly_count = int(np.count_nonzero(anomalies))
+    
+    return TrendStats(mean_weight, weight_slope, completion_rate, anomaly_count)
+
 
 class CatCareTools:
     """Tools available to the AI Agent"""
     
-    def __init__(self, db_session):
+    def __init__(self, db_session: AsyncSession):
         self.db = db_session
     
-    def get_cat_data(self, cat_id: str) -> Dict[str, Any]:
+    async def get_cat_data(self, cat_id: str, include_details: bool = False) -> Dict[str, Any]:
         """Get comprehensive cat data"""
+        log = logger.bind(cat_id=cat_id)
         try:
-            cat = self.db.query(Cat).filter(Cat.id == cat_id).first()
+            cat = await self.db.get(Cat, cat_id)
             if not cat:
                 raise AIAgentError(f"Cat with id {cat_id} not found")
             
-            # Get recent activities
-            recent_activities = self.db.query(ActivityRecord).filter(
-                ActivityRecord.cat_id == cat_id,
-                ActivityRecord.created_at >= datetime.now() - timedelta(days=7)
-            ).all()
+            now = datetime.now()
+            cutoff_7d = now - timedelta(days=7)
+            cutoff_30d = now - timedelta(days=30)
             
-            # Get health records
-            health_records = self.db.query(HealthRecord).filter(
+            # Aggregate recent activities and count health records in one round trip
+            health_records_count = select(func.count(HealthRecord.id)).where(
                 HealthRecord.cat_id == cat_id,
-                HealthRecord.created_at >= datetime.now() - timedelta(days=30)
-            ).all()
+                HealthRecord.created_at >= cutoff_30d
+            ).scalar_subquery()
+            result = await self.db.execute(
+                select(
+                    func.count(ActivityRecord.id),
+                    func.sum(case((ActivityRecord.status == ActivityStatus.COMPLETED, 1), else_=0)),
+                    func.avg(ActivityRecord.actual_duration),
+                    health_records_count
+                ).where(
+                    ActivityRecord.cat_id == cat_id,
+                    ActivityRecord.created_at >= cutoff_7d
+                )
+            )
+            total_activities, completed_activities, avg_duration, health_records_count = result.one()
             
             # Calculate statistics
-            total_activities = len(recent_activities)
-            completed_activities = len([a for a in recent_activities if a.status.value == "completed"])
-            completion_rate = completed_activities / total_activities if total_activities > 0 else 0
-            
-            # Calculate average activity duration
-            durations = [a.actual_duration for a in recent_activities if a.actual_duration]
-            avg_duration = sum(durations) / len(durations) if durations else 0
+            completion_rate = (completed_activities or 0) / total_activities if total_activities > 0 else 0
             
-            return {
+            cat_data = {
                 "id": str(cat.id),
                 "name": cat.name,
                 "age": cat.age_in_years,
                 "breed": cat.breed,
                 "weight": cat.weight,
                 "health_condition": cat.health_condition,
+                "statistics": {
+                    "total_activities_7d": total_activities,
+                    "completion_rate": completion_rate,
+                    "avg_activity_duration": float(avg_duration or 0),
+                    "health_records_30d": health_records_count
+                }
+            }
+            
+            if not include_details:
+                return cat_data
+            
+            # Load the individual records only when the caller needs them
+            result = await self.db.execute(
+                select(ActivityRecord).where(
+                    ActivityRecord.cat_id == cat_id,
+                    ActivityRecord.created_at >= cutoff_7d
+                )
+            )
+            recent_activities = result.scalars().all()
+            
+            result = await self.db.execute(
+                select(HealthRecord).where(
+                    HealthRecord.cat_id == cat_id,
+                    HealthRecord.created_at >= cutoff_30d
+                )
+            )
+            health_records = result.scalars().all()
+            
+            return {
+                **cat_data,
                 "recent_activities": [
                     {
-                        "type": a.type.value,
+                        "type": TYPE_STR[a.type],
                         "scheduled_time": a.scheduled_time.isoformat(),
-                        "status": a.status.value,
+                        "status": STATUS_STR[a.status],
                         "duration": a.actual_duration
                     }
                     for a in recent_activities
@@ -70,19 +159,13 @@ class CatCareTools:
                         "recorded_at": h.recorded_at.isoformat()
                     }
                     for h in health_records
-                ],
-                "statistics": {
-                    "total_activities_7d": total_activities,
-                    "completion_rate": completion_rate,
-                    "avg_activity_duration": avg_duration,
-                    "health_records_30d": len(health_records)
-                }
+                ]
             }
         except Exception as e:
-            logger.error("Error getting cat data", cat_id=cat_id, error=str(e))
+            log.error("Error getting cat data", error=str(e))
             raise AIAgentError(f"Failed to get cat data: {str(e)}")
     
-    def create_reminder(
+    async def create_reminder(
         self,
         cat_id: str,
         title: str,
@@ -92,11 +175,11 @@ class CatCareTools:
         description: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a new reminder for a cat"""
+        log = logger.bind(cat_id=cat_id)
         try:
-            from app.models import ReminderFrequency, CatCareType, ReminderTime
             
             # Validate cat exists
-            cat = self.db.query(Cat).filter(Cat.id == cat_id).first()
+            cat = await self.db.get(Cat, cat_id)
             if not cat:
                 raise AIAgentError(f"Cat with id {cat_id} not found")
             
@@ -104,30 +187,33 @@ class CatCareTools:
             reminder = Reminder(
                 cat_id=cat_id,
                 title=title,
-                type=CatCareType(reminder_type),
-                frequency=ReminderFrequency(frequency),
+                type=_enum_member(_CARE_TYPES, reminder_type, "reminder type"),
+                frequency=_enum_member(_FREQUENCIES, frequency, "frequency"),
                 description=description,
                 is_enabled=True
             )
             
             self.db.add(reminder)
-            self.db.flush()  # Get the ID
+            await self.db.flush()  # Get the ID
             
-            # Create reminder times
+            # Parse all times up front, keeping one row per slot
+            parsed_times = {}
+            invalid_times = []
             for time_str in times:
                 try:
                     hour, minute = map(int, time_str.split(":"))
-                    reminder_time = ReminderTime(
-                        reminder_id=reminder.id,
-                        hour=hour,
-                        minute=minute
-                    )
-                    self.db.add(reminder_time)
+                    parsed_times[(hour, minute)] = {"reminder_id": reminder.id, "hour": hour, "minute": minute}
                 except ValueError:
-                    logger.warning("Invalid time format", time_str=time_str)
-                    continue
+                    invalid_times.append(time_str)
+            
+            if invalid_times:
+                log.warning("Invalid time format", invalid_times=invalid_times)
+            
+            # Create reminder times in one bulk insert
+            if parsed_times:
+                await self.db.execute(pg_insert(ReminderTime).on_conflict_do_nothing(), list(parsed_times.values()))
             
-            self.db.commit()
+            await self.db.commit()
             
             return {
                 "id": str(reminder.id),
@@ -138,55 +224,106 @@ class CatCareTools:
                 "created_at": reminder.created_at.isoformat()
             }
         except Exception as e:
-            self.db.rollback()
-            logger.error("Error creating reminder", error=str(e))
+            await self.db.rollback()
+            log.error("Error creating reminder", error=str(e))
             raise AIAgentError(f"Failed to create reminder: {str(e)}")
     
-    def analyze_health_trend(self, cat_id: str, days: int = 30) -> Dict[str, Any]:
+    async def analyze_health_trend(self, cat_id: str, days: int = 30) -> Dict[str, Any]:
         """Analyze health trends for a cat"""
+        log = logger.bind(cat_id=cat_id)
         try:
-            # Get health records
-            health_records = self.db.query(HealthRecord).filter(
-                HealthRecord.cat_id == cat_id,
-                HealthRecord.created_at >= datetime.now() - timedelta(days=days)
-            ).order_by(HealthRecord.recorded_at).all()
+            now = datetime.now()
+            cutoff = now - timedelta(days=days)
+            
+            # Count health records and collect the ordered weight series in one row
+            is_weight = (HealthRecord.record_type == "weight") & (HealthRecord.value != 0)
+            result = await self.db.execute(
+                select(
+                    func.count(HealthRecord.id),
+                    func.array_agg(aggregate_order_by(HealthRecord.value, HealthRecord.recorded_at)).filter(is_weight),
+                    func.array_agg(
+                        aggregate_order_by(func.extract("epoch", HealthRecord.recorded_at), HealthRecord.recorded_at)
+                    ).filter(is_weight)
+                ).where(
+                    HealthRecord.cat_id == cat_id,
+                    HealthRecord.created_at >= cutoff
+                )
+            )
+            health_records_count, weight_values, weight_times = result.one()
             
-            # Get activity records
-            activity_records = self.db.query(ActivityRecord).filter(
-                ActivityRecord.cat_id == cat_id,
-                ActivityRecord.created_at >= datetime.now() - timedelta(days=days)
-            ).all()
+            # Get activity columns with NULLs already resolved by the database
+            result = await self.db.execute(
+                select(
+                    func.coalesce(ActivityRecord.actual_duration, 0),
+                    func.coalesce(ActivityRecord.status == ActivityStatus.COMPLETED, False),
+                    func.coalesce(ActivityRecord.anomaly_detected, False)
+                ).where(
+                    ActivityRecord.cat_id == cat_id,
+                    ActivityRecord.created_at >= cutoff
+                ).order_by(ActivityRecord.scheduled_time)
+            )
+            activity_records = result.all()
+            
+            # Transpose rows into arrays once and reduce them in NumPy
+            n_activities = len(activity_records)
+            weights = np.array(weight_values or (), dtype=np.float64)
+            activities = np.array(activity_records, dtype=np.float64).reshape(n_activities, 3)
+            durations = activities[:, 0]
+            completed = activities[:, 1].astype(np.bool_)
             
             # Calculate trends
-            trends = self._calculate_health_trends(health_records, activity_records)
+            trends = self._calculate_health_trends(weights, durations, completed)
+            stats = _trend_stats(
+                np.array(weight_times or (), dtype=np.float64),
+                weights,
+                completed,
+                activities[:, 2].astype(np.bool_)
+            )
             
             return {
                 "cat_id": cat_id,
                 "analysis_period_days": days,
-                "health_records_count": len(health_records),
+                "health_records_count": health_records_count,
                 "activity_records_count": len(activity_records),
                 "trends": trends,
-                "generated_at": datetime.now().isoformat()
+                "statistics": stats._asdict(),
+                "generated_at": now.isoformat()
             }
         except Exception as e:
-            logger.error("Error analyzing health trend", cat_id=cat_id, error=str(e))
+            log.error("Error analyzing health trend", error=str(e))
             raise AIAgentError(f"Failed to analyze health trend: {str(e)}")
     
-    def get_recent_activities(self, cat_id: str, days: int = 7) -> List[Dict[str, Any]]:
+    async def get_recent_activities(self, cat_id: str, days: int = 7) -> List[Dict[str, Any]]:
         """Get recent activities for a cat"""
+        log = logger.bind(cat_id=cat_id)
         try:
-            activities = self.db.query(ActivityRecord).filter(
-                ActivityRecord.cat_id == cat_id,
-                ActivityRecord.created_at >= datetime.now() - timedelta(days=days)
-            ).order_by(ActivityRecord.scheduled_time.desc()).all()
+            # Only the columns we serialize; skips hydrating the JSON blobs
+            result = await self.db.execute(
+                select(
+                    ActivityRecord.id,
+                    ActivityRecord.type,
+                    ActivityRecord.scheduled_time,
+                    ActivityRecord.complete_time,
+                    ActivityRecord.status,
+                    ActivityRecord.actual_duration,
+                    ActivityRecord.notes,
+                    ActivityRecord.quality_rating
+                ).where(
+                    ActivityRecord.cat_id == cat_id,
+                    ActivityRecord.created_at >= datetime.now() - timedelta(days=days)
+                ).order_by(ActivityRecord.scheduled_time.desc())
+            )
+            activities = result.all()
+            if not activities:
+                return []
             
             return [
                 {
                     "id": str(a.id),
-                    "type": a.type.value,
+                    "type": TYPE_STR[a.type],
                     "scheduled_time": a.scheduled_time.isoformat(),
                     "complete_time": a.complete_time.isoformat() if a.complete_time else None,
-                    "status": a.status.value,
+                    "status": STATUS_STR[a.status],
                     "duration": a.actual_duration,
                     "notes": a.notes,
                     "quality_rating": a.quality_rating
@@ -194,10 +331,51 @@ class CatCareTools:
                 for a in activities
             ]
         except Exception as e:
-            logger.error("Error getting recent activities", cat_id=cat_id, error=str(e))
+            log.error("Error getting recent activities", error=str(e))
             raise AIAgentError(f"Failed to get recent activities: {str(e)}")
     
-    def update_activity_status(
+    async def summarize_recent_activities(self, cat_id: str, days: int = 7) -> Dict[str, Any]:
+        """Summarize recent activities for a cat without materializing the rows"""
+        log = logger.bind(cat_id=cat_id)
+        try:
+            result = await self.db.stream(
+                select(
+                    ActivityRecord.type,
+                    ActivityRecord.status,
+                    ActivityRecord.actual_duration,
+                    ActivityRecord.anomaly_detected
+                ).where(
+                    ActivityRecord.cat_id == cat_id,
+                    ActivityRecord.created_at >= datetime.now() - timedelta(days=days)
+                ).execution_options(yield_per=128)
+            )
+            
+            # Aggregate counters as rows arrive
+            by_type = Counter()
+            total = completed = anomalies = total_minutes = 0
+            async for row in result:
+                total += 1
+                by_type[TYPE_STR[row.type]] += 1
+                if row.status is ActivityStatus.COMPLETED:
+                    completed += 1
+                if row.anomaly_detected:
+                    anomalies += 1
+                total_minutes += row.actual_duration or 0
+            
+            return {
+                "period_days": days,
+                "total": total,
+                "completed": completed,
+                "completion_rate": completed / total if total > 0 else 0,
+                "by_type": dict(by_type),
+                "total_minutes": total_minutes,
+                "anomalies": anomalies
+            }
+        except Exception as e:
+            log.error("Error summarizing recent activities", error=str(e))
+            raise AIAgentError(f"Failed to summarize recent activities: {str(e)}")
+    
+    async def update_activity_status(
         self,
         activity_id: str,
         status: str,
@@ -205,17 +383,14 @@ class CatCareTools:
         quality_rating: Optional[int] = None
     ) -> Dict[str, Any]:
         """Update activity status"""
+        log = logger.bind(activity_id=activity_id)
         try:
-            from app.models import ActivityStatus
-            
-            activity = self.db.query(ActivityRecord).filter(
-                ActivityRecord.id == activity_id
-            ).first()
+            activity = await self.db.get(ActivityRecord, activity_id)
             
             if not activity:
                 raise AIAgentError(f"Activity with id {activity_id} not found")
             
-            activity.status = ActivityStatus(status)
+            activity.status = _enum_member(_ACTIVITY_STATUSES, status, "status")
             if status == "completed":
                 activity.complete_time = datetime.now()
             if notes:
@@ -223,7 +398,8 @@ class CatCareTools:
             if quality_rating:
                 activity.quality_rating = quality_rating
             
-            self.db.commit()
+            await self.db.commit()
+            invalidate_context(activity.cat_id)
             
             return {
                 "id": str(activity.id),
@@ -232,11 +408,11 @@ class CatCareTools:
                 "updated_at": datetime.now().isoformat()
             }
         except Exception as e:
-            self.db.rollback()
-            logger.error("Error updating activity status", activity_id=activity_id, error=str(e))
+            await self.db.rollback()
+            log.error("Error updating activity status", error=str(e))
             raise AIAgentError(f"Failed to update activity status: {str(e)}")
     
-    def create_health_record(
+    async def create_health_record(
         self,
         cat_id: str,
         record_type: str,
@@ -245,6 +421,7 @@ class CatCareTools:
         notes: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a health record"""
+        log = logger.bind(cat_id=cat_id)
         try:
             health_record = HealthRecord(
                 cat_id=cat_id,
@@ -256,7 +433,8 @@ class CatCareTools:
             )
             
             self.db.add(health_record)
-            self.db.commit()
+            await self.db.commit()
+            invalidate_context(cat_id)
             
             return {
                 "id": str(health_record.id),
@@ -266,16 +444,17 @@ class CatCareTools:
                 "recorded_at": health_record.recorded_at.isoformat()
             }
         except Exception as e:
-            self.db.rollback()
-            logger.error("Error creating health record", error=str(e))
+            await self.db.rollback()
+            log.error("Error creating health record", error=str(e))
             raise AIAgentError(f"Failed to create health record: {str(e)}")
     
     def _calculate_health_trends(
         self,
-        health_records: List[HealthRecord],
-        activity_records: List[ActivityRecord]
+        weights: np.ndarray,
+        durations: np.ndarray,
+        completed: np.ndarray
     ) -> Dict[str, Any]:
-        """Calculate health trends from records"""
+        """Calculate health trends from chronologically ordered record arrays"""
         trends = {
             "weight_trend": "stable",
             "activity_trend": "stable",
@@ -284,11 +463,8 @@ class CatCareTools:
         }
         
         # Calculate weight trend
-        weight_records = [r for r in health_records if r.record_type == "weight" and r.value]
-        if len(weight_records) >= 2:
-            recent_weight = weight_records[-1].value
-            older_weight = weight_records[0].value
-            weight_change = (recent_weight - older_weight) / older_weight
+        if weights.size >= 2:
+            weight_change = (weights[-1] - weights[0]) / weights[0]
             
             if weight_change > 0.05:
                 trends["weight_trend"] = "increasing"
@@ -296,12 +472,9 @@ class CatCareTools:
                 trends["weight_trend"] = "decreasing"
         
         # Calculate activity trend
-        if len(activity_records) >= 7:
-            recent_activities = activity_records[-7:]
-            older_activities = activity_records[:7]
-            
-            recent_avg_duration = sum(a.actual_duration or 0 for a in recent_activities) / len(recent_activities)
-            older_avg_duration = sum(a.actual_duration or 0 for a in older_activities) / len(older_activities)
+        if durations.size >= 7:
+            recent_avg_duration = durations[-7:].mean()
+            older_avg_duration = durations[:7].mean()
             
             if recent_avg_duration > older_avg_duration * 1.1:
                 trends["activity_trend"] = "increasing"
@@ -309,12 +482,9 @@ class CatCareTools:
                 trends["activity_trend"] = "decreasing"
         
         # Calculate completion rate trend
-        if len(activity_records) >= 14:
-            recent_activities = activity_records[-7:]
-            older_activities = activity_records[-14:-7]
-            
-            recent_completion = len([a for a in recent_activities if a.status.value == "completed"]) / len(recent_activities)
-            older_completion = len([a for a in older_activities if a.status.value == "completed"]) / len(older_activities)
+        if completed.size >= 14:
+            recent_completion = completed[-7:].mean()
+            older_completion = completed[-14:-7].mean()
             
             if recent_completion > older_completion + 0.1:
                 trends["completion_rate_trend"] = "improving"
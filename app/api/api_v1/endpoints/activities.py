@@ -3,18 +3,35 @@ Activities API endpoints
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from datetime import datetime
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime, timedelta
+from uuid import UUID
 
-from app.core.database import get_db
-from app.core.exceptions import NotFoundError
+from app.ai.context_cache import invalidate_context
+from app.core.database import get_async_db
+from app.core.exceptions import NotFoundError, ValidationError
 from app.models import ActivityRecord, Cat, ActivityStatus, CatCareType
 import structlog
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Request string -> enum member, looked up directly instead of via Enum(value)
+_CARE_TYPES = CatCareType._value2member_map_
+_ACTIVITY_STATUSES = ActivityStatus._value2member_map_
+
+
+def _enum_member(members, value: str, field: str):
+    """Coerce a request string to its enum member"""
+    try:
+        return members[value]
+    except KeyError:
+        raise ValidationError(f"Invalid {field}: {value}")
+
 
 class ActivityCreate(BaseModel):
     """Activity creation model"""
@@ -36,13 +53,15 @@ class ActivityUpdate(BaseModel):
 
 class ActivityResponse(BaseModel):
     """Activity response model"""
-    id: str
-    reminder_id: str
-    cat_id: str
-    type: str
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    reminder_id: UUID
+    cat_id: UUID
+    type: CatCareType
     scheduled_time: datetime
     complete_time: Optional[datetime]
-    status: str
+    status: ActivityStatus
     actual_duration: Optional[int]
     notes: Optional[str]
     quality_rating: Optional[int]
@@ -51,9 +70,6 @@ class ActivityResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 
 @router.get("/", response_model=List[ActivityResponse])
 async def get_activities(
@@ -62,43 +78,27 @@ async def get_activities(
     days: int = 30,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of activities"""
     try:
-        from datetime import timedelta
-        
-        query = db.query(ActivityRecord).filter(
-            ActivityRecord.created_at >= datetime.now() - timedelta(days=days)
+        # Responses only use FK columns; fail fast instead of lazy-loading per row
+        query = select(ActivityRecord).options(raiseload("*")).where(
+            ActivityRecord.created_at >= func.now() - timedelta(days=days)
         )
         
         if cat_id:
-            query = query.filter(ActivityRecord.cat_id == cat_id)
+            query = query.where(ActivityRecord.cat_id == cat_id)
         if status:
-            query = query.filter(ActivityRecord.status == ActivityStatus(status))
+            query = query.where(ActivityRecord.status == _enum_member(_ACTIVITY_STATUSES, status, "status"))
         
-        activities = query.order_by(ActivityRecord.scheduled_time.desc()).offset(skip).limit(limit).all()
+        result = await db.execute(query.order_by(ActivityRecord.scheduled_time.desc()).offset(skip).limit(limit))
+        activities = result.scalars().all()
         
-        return [
-            {
-                "id": str(activity.id),
-                "reminder_id": str(activity.reminder_id),
-                "cat_id": str(activity.cat_id),
-                "type": activity.type.value,
-                "scheduled_time": activity.scheduled_time,
-                "complete_time": activity.complete_time,
-                "status": activity.status.value,
-                "actual_duration": activity.actual_duration,
-                "notes": activity.notes,
-                "quality_rating": activity.quality_rating,
-                "cat_behavior": activity.cat_behavior,
-                "anomaly_detected": activity.anomaly_detected,
-                "created_at": activity.created_at,
-                "updated_at": activity.updated_at
-            }
-            for activity in activities
-        ]
+        return [ActivityResponse.model_validate(activity) for activity in activities]
         
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Error getting activities", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -107,30 +107,15 @@ async def get_activities(
 @router.get("/{activity_id}", response_model=ActivityResponse)
 async def get_activity(
     activity_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get activity by ID"""
     try:
-        activity = db.query(ActivityRecord).filter(ActivityRecord.id == activity_id).first()
+        activity = await db.get(ActivityRecord, activity_id, options=[raiseload("*")])
         if not activity:
             raise NotFoundError("Activity", activity_id)
         
-        return {
-            "id": str(activity.id),
-            "reminder_id": str(activity.reminder_id),
-            "cat_id": str(activity.cat_id),
-            "type": activity.type.value,
-            "scheduled_time": activity.scheduled_time,
-            "complete_time": activity.complete_time,
-            "status": activity.status.value,
-            "actual_duration": activity.actual_duration,
-            "notes": activity.notes,
-            "quality_rating": activity.quality_rating,
-            "cat_behavior": activity.cat_behavior,
-            "anomaly_detected": activity.anomaly_detected,
-            "created_at": activity.created_at,
-            "updated_at": activity.updated_at
-        }
+        return ActivityResponse.model_validate(activity)
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -142,50 +127,40 @@ async def get_activity(
 @router.post("/", response_model=ActivityResponse)
 async def create_activity(
     activity_data: ActivityCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new activity"""
     try:
         # Validate cat exists
-        cat = db.query(Cat).filter(Cat.id == activity_data.cat_id).first()
-        if not cat:
+        if await db.scalar(select(Cat.id).where(Cat.id == activity_data.cat_id)) is None:
             raise NotFoundError("Cat", activity_data.cat_id)
         
         # Create activity
         activity = ActivityRecord(
             reminder_id=activity_data.reminder_id,
             cat_id=activity_data.cat_id,
-            type=CatCareType(activity_data.type),
+            type=_enum_member(_CARE_TYPES, activity_data.type, "type"),
             scheduled_time=activity_data.scheduled_time,
             status=ActivityStatus.PENDING,
-            notes=activity_data.notes
+            notes=activity_data.notes,
+            anomaly_detected=False
         )
         
+        # Serialize before commit so expiry does not force a reload
         db.add(activity)
-        db.commit()
-        db.refresh(activity)
+        await db.flush()
+        response = ActivityResponse.model_validate(activity)
+        await db.commit()
+        invalidate_context(activity_data.cat_id)
         
-        return {
-            "id": str(activity.id),
-            "reminder_id": str(activity.reminder_id),
-            "cat_id": str(activity.cat_id),
-            "type": activity.type.value,
-            "scheduled_time": activity.scheduled_time,
-            "complete_time": activity.complete_time,
-            "status": activity.status.value,
-            "actual_duration": activity.actual_duration,
-            "notes": activity.notes,
-            "quality_rating": activity.quality_rating,
-            "cat_behavior": activity.cat_behavior,
-            "anomaly_detected": activity.anomaly_detected,
-            "created_at": activity.created_at,
-            "updated_at": activity.updated_at
-        }
+        return response
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error creating activity", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -194,50 +169,43 @@ async def create_activity(
 async def update_activity(
     activity_id: str,
     activity_data: ActivityUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update activity"""
     try:
-        activity = db.query(ActivityRecord).filter(ActivityRecord.id == activity_id).first()
-        if not activity:
-            raise NotFoundError("Activity", activity_id)
+        values = activity_data.model_dump(exclude_unset=True)
         
-        # Update fields
-        update_data = activity_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            if field == "status" and value:
-                setattr(activity, field, ActivityStatus(value))
-                if value == "completed" and not activity.complete_time:
-                    activity.complete_time = datetime.now()
-            else:
-                setattr(activity, field, value)
+        # Status changes carry side effects; plain fields are copied as-is
+        status = values.get("status")
+        if status:
+            values["status"] = _enum_member(_ACTIVITY_STATUSES, status, "status")
+            if status == "completed":
+                values["complete_time"] = func.coalesce(ActivityRecord.complete_time, func.now())
         
-        activity.updated_at = datetime.now()
+        # Update and read back the row in a single statement
+        result = await db.execute(
+            update(ActivityRecord)
+            .where(ActivityRecord.id == activity_id)
+            .values(**values, updated_at=func.now())
+            .returning(ActivityRecord)
+            .execution_options(synchronize_session=False)
+        )
+        activity = result.scalar_one_or_none()
+        if not activity:
+            raise NotFoundError("Activity", activity_id)
         
-        db.commit()
-        db.refresh(activity)
+        response = ActivityResponse.model_validate(activity)
+        await db.commit()
+        invalidate_context(response.cat_id)
         
-        return {
-            "id": str(activity.id),
-            "reminder_id": str(activity.reminder_id),
-            "cat_id": str(activity.cat_id),
-            "type": activity.type.value,
-            "scheduled_time": activity.scheduled_time,
-            "complete_time": activity.complete_time,
-            "status": activity.status.value,
-            "actual_duration": activity.actual_duration,
-            "notes": activity.notes,
-            "quality_rating": activity.quality_rating,
-            "cat_behavior": activity.cat_behavior,
-            "anomaly_detected": activity.anomaly_detected,
-            "created_at": activity.created_at,
-            "updated_at": activity.updated_at
-        }
+        return response
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error updating activity", activity_id=activity_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -248,16 +216,17 @@ async def complete_activity(
     notes: Optional[str] = None,
     quality_rating: Optional[int] = None,
     actual_duration: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark activity as completed"""
     try:
-        activity = db.query(ActivityRecord).filter(ActivityRecord.id == activity_id).first()
+        activity = await db.get(ActivityRecord, activity_id, options=[raiseload("*")])
         if not activity:
             raise NotFoundError("Activity", activity_id)
         
+        now = datetime.now()
         activity.status = ActivityStatus.COMPLETED
-        activity.complete_time = datetime.now()
+        activity.complete_time = now
         
         if notes:
             activity.notes = notes
@@ -266,20 +235,23 @@ async def complete_activity(
         if actual_duration:
             activity.actual_duration = actual_duration
         
-        activity.updated_at = datetime.now()
+        activity.updated_at = now
+        complete_time = activity.complete_time
+        cat_id = activity.cat_id
         
-        db.commit()
+        await db.commit()
+        invalidate_context(cat_id)
         
         return {
             "message": "Activity completed successfully",
             "activity_id": activity_id,
-            "complete_time": activity.complete_time.isoformat()
+            "complete_time": complete_time.isoformat()
         }
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error completing activity", activity_id=activity_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -287,40 +259,57 @@ async def complete_activity(
 @router.get("/cats/{cat_id}/today")
 async def get_today_activities(
     cat_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get today's activities for a cat"""
     try:
-        from datetime import timedelta
-        
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        # Let the database compute the day boundaries
+        today_start = func.date_trunc("day", func.now())
         tomorrow_start = today_start + timedelta(days=1)
         
-        activities = db.query(ActivityRecord).filter(
-            ActivityRecord.cat_id == cat_id,
-            ActivityRecord.scheduled_time >= today_start,
-            ActivityRecord.scheduled_time < tomorrow_start
-        ).order_by(ActivityRecord.scheduled_time).all()
+        # Fetch only the columns the day view shows, as plain rows
+        result = await db.execute(
+            select(
+                ActivityRecord.id,
+                ActivityRecord.type,
+                ActivityRecord.scheduled_time,
+                ActivityRecord.complete_time,
+                ActivityRecord.status,
+                ActivityRecord.notes,
+                ActivityRecord.quality_rating
+            ).where(
+                ActivityRecord.cat_id == cat_id,
+                ActivityRecord.scheduled_time >= today_start,
+                ActivityRecord.scheduled_time < tomorrow_start
+            ).order_by(ActivityRecord.scheduled_time)
+        )
+        activities = result.all()
         
-        return {
+        # Serialize and count statuses in a single pass
+        serialized = []
+        completed = pending = 0
+        for activity in activities:
+            activity_status = activity.status
+            serialized.append({
+                "id": activity.id,
+                "type": activity.type.value,
+                "scheduled_time": activity.scheduled_time,
+                "complete_time": activity.complete_time,
+                "status": activity_status.value,
+                "notes": activity.notes,
+                "quality_rating": activity.quality_rating
+            })
+            completed += activity_status is ActivityStatus.COMPLETED
+            pending += activity_status is ActivityStatus.PENDING
+        
+        return ORJSONResponse({
             "cat_id": cat_id,
-            "date": today_start.date().isoformat(),
-            "activities": [
-                {
-                    "id": str(activity.id),
-                    "type": activity.type.value,
-                    "scheduled_time": activity.scheduled_time.isoformat(),
-                    "complete_time": activity.complete_time.isoformat() if activity.complete_time else None,
-                    "status": activity.status.value,
-                    "notes": activity.notes,
-                    "quality_rating": activity.quality_rating
-                }
-                for activity in activities
-            ],
-            "total_count": len(activities),
-            "completed_count": len([a for a in activities if a.status == ActivityStatus.COMPLETED]),
-            "pending_count": len([a for a in activities if a.status == ActivityStatus.PENDING])
-        }
+            "date": datetime.now().date(),
+            "activities": serialized,
+            "total_count": len(serialized),
+            "completed_count": completed,
+            "pending_count": pending
+        })
         
     except Exception as e:
         logger.error("Error getting today's activities", cat_id=cat_id, error=str(e))
@@ -3,13 +3,24 @@ AI Agent API endpoints
 """
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
+import time
+import uuid
+import msgspec
+import numpy as np
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db
 from app.core.exceptions import AIAgentError, NotFoundError
 from app.ai.agent import CatAlertAgent
+from app.ai.interaction_writer import interaction_writer
+from app.ai.llm_service import get_llm_service
+from app.ai.semantic_cache import response_cache
 from app.models import User, Cat
 import structlog
 
@@ -40,6 +51,7 @@ class InsightRequest(BaseModel):
     """Insight generation request model"""
     cat_id: str
     analysis_period: str = "7d"  # 1d, 7d, 30d
+    analysis_periods: Optional[List[str]] = None  # several periods in one call
 
 
 class InsightResponse(BaseModel):
@@ -49,21 +61,73 @@ class InsightResponse(BaseModel):
     generated_at: str
 
 
+async def _ensure_user_and_cat(db: AsyncSession, user_id: str, cat_id: str) -> None:
+    """Validate user and cat exist in a single round-trip"""
+    result = await db.execute(
+        select(
+            select(User.id).where(User.id == user_id).scalar_subquery(),
+            select(Cat.id).where(Cat.id == cat_id).scalar_subquery()
+        )
+    )
+    found_user, found_cat = result.one()
+    if found_user is None:
+        raise NotFoundError("User", user_id)
+    if found_cat is None:
+        raise NotFoundError("Cat", cat_id)
+
+
+async def _embed_message(message: str) -> Optional[np.ndarray]:
+    """Embed a chat message for the semantic cache, or None if embedding fails"""
+    try:
+        return await get_llm_service().embed(message)
+    except Exception as e:
+        logger.warning("Semantic cache lookup skipped", error=str(e))
+        return None
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_agent(
     request: ChatRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Chat with AI Agent"""
     try:
-        # Validate user and cat exist
-        user = db.query(User).filter(User.id == request.user_id).first()
-        if not user:
-            raise NotFoundError("User", request.user_id)
+        start_time = time.time()
         
-        cat = db.query(Cat).filter(Cat.id == request.cat_id).first()
-        if not cat:
-            raise NotFoundError("Cat", request.cat_id)
+        # Validate user and cat exist while the message is embedded
+        embedding = None
+        if settings.SEMANTIC_CACHE_ENABLED:
+            _, embedding = await asyncio.gather(
+                _ensure_user_and_cat(db, request.user_id, request.cat_id),
+                _embed_message(request.message)
+            )
+        else:
+            await _ensure_user_and_cat(db, request.user_id, request.cat_id)
+        
+        # Answer paraphrases of a recent question without calling the LLM
+        if embedding is not None:
+            cached = response_cache.get(request.cat_id, embedding)
+            if cached is not None:
+                session_id = request.session_id or str(uuid.uuid4())
+                processing_time_ms = int((time.time() - start_time) * 1000)
+                
+                # Cache hits are still part of the conversation history
+                interaction_writer.submit(
+                    user_id=request.user_id,
+                    cat_id=request.cat_id,
+                    session_id=session_id,
+                    interaction_type=cached["type"],
+                    user_input=request.message,
+                    ai_response=cached["message"],
+                    processing_time_ms=processing_time_ms,
+                    model_used="semantic_cache"
+                )
+                
+                return ChatResponse(
+                    **cached,
+                    session_id=session_id,
+                    processing_time_ms=processing_time_ms
+                )
         
         # Initialize AI Agent
         agent = CatAlertAgent(db)
@@ -76,6 +140,15 @@ async def chat_with_agent(
             session_id=request.session_id
         )
         
+        if embedding is not None and result["success"]:
+            response_cache.put(request.cat_id, embedding, {
+                "success": True,
+                "message": result["message"],
+                "type": result["type"],
+                "suggestions": result["suggestions"],
+                "insights": result["insights"]
+            })
+        
         return ChatResponse(**result)
         
     except NotFoundError as e:
@@ -87,49 +160,99 @@ async def chat_with_agent(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/chat/stream")
+async def chat_with_agent_stream(
+    request: ChatRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Chat with AI Agent, streaming the reply as server-sent events"""
+    try:
+        # Validate user and cat exist
+        await _ensure_user_and_cat(db, request.user_id, request.cat_id)
+        
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error("Chat stream endpoint error", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    # Initialize AI Agent
+    agent = CatAlertAgent(db)
+    
+    return StreamingResponse(
+        agent.process_user_request_stream(
+            user_id=request.user_id,
+            cat_id=request.cat_id,
+            user_input=request.message,
+            session_id=request.session_id
+        ),
+        media_type="text/event-stream"
+    )
+
+
+async def _insights_for_period(agent: CatAlertAgent, cat_id: str, period: str) -> List[Any]:
+    """Generate insights for one analysis period"""
+    if period == "1d":
+        return await agent.generate_daily_insights(cat_id)
+    
+    # For other periods, use health trend analysis on its own session
+    days = int(period[:-1])  # Remove 'd' suffix
+    health_trends = await agent._run_tool("analyze_health_trend", cat_id, days=days)
+    
+    return [{
+        "type": "health_trend",
+        "title": f"{period}健康趋势分析",
+        "description": f"基于{period}数据的健康趋势分析",
+        "data": health_trends,
+        "priority": "medium"
+    }]
+
+
+def _serialize_insight(insight: Any) -> Dict[str, Any]:
+    """Shape a stored AIInsight or an ad-hoc insight dict for the API"""
+    if isinstance(insight, dict):
+        return {
+            "id": None,
+            "type": insight.get("type"),
+            "title": insight.get("title"),
+            "description": insight.get("description"),
+            "priority": insight.get("priority"),
+            "generated_at": None
+        }
+    return {
+        "id": insight.id,
+        "type": insight.insight_type,
+        "title": insight.title,
+        "description": insight.description,
+        "priority": insight.priority,
+        "generated_at": insight.generated_at.isoformat() if insight.generated_at else None
+    }
+
+
 @router.post("/insights", response_model=InsightResponse)
 async def generate_insights(
     request: InsightRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate AI insights for a cat"""
     try:
         # Validate cat exists
-        cat = db.query(Cat).filter(Cat.id == request.cat_id).first()
-        if not cat:
+        if await db.scalar(select(Cat.id).where(Cat.id == request.cat_id)) is None:
             raise NotFoundError("Cat", request.cat_id)
         
         # Initialize AI Agent
         agent = CatAlertAgent(db)
         
-        # Generate insights based on period
-        if request.analysis_period == "1d":
-            insights = await agent.generate_daily_insights(request.cat_id)
-        else:
-            # For other periods, use health trend analysis
-            from app.ai.tools import CatCareTools
-            tools = CatCareTools(db)
-            days = int(request.analysis_period[:-1])  # Remove 'd' suffix
-            health_trends = tools.analyze_health_trend(request.cat_id, days)
-            
-            insights = [{
-                "type": "health_trend",
-                "title": f"{request.analysis_period}健康趋势分析",
-                "description": f"基于{request.analysis_period}数据的健康趋势分析",
-                "data": health_trends,
-                "priority": "medium"
-            }]
+        # Generate insights for each requested period concurrently
+        periods = list(dict.fromkeys(request.analysis_periods or [request.analysis_period]))
+        results = await asyncio.gather(
+            *(_insights_for_period(agent, request.cat_id, period) for period in periods)
+        )
+        insights = [insight for result in results for insight in result]
         
         return InsightResponse(
             success=True,
-            insights=[{
-                "id": str(insight.id) if hasattr(insight, 'id') else None,
-                "type": insight.insight_type if hasattr(insight, 'insight_type') else insight.get('type'),
-                "title": insight.title if hasattr(insight, 'title') else insight.get('title'),
-                "description": insight.description if hasattr(insight, 'description') else insight.get('description'),
-                "priority": insight.priority if hasattr(insight, 'priority') else insight.get('priority'),
-                "generated_at": insight.generated_at.isoformat() if hasattr(insight, 'generated_at') else None
-            } for insight in insights],
+            insights=[_serialize_insight(insight) for insight in insights],
             generated_at=datetime.now().isoformat()
         )
         
@@ -144,13 +267,12 @@ async def generate_insights(
 async def get_cat_analysis(
     cat_id: str,
     days: int = 30,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get comprehensive cat analysis"""
     try:
         # Validate cat exists
-        cat = db.query(Cat).filter(Cat.id == cat_id).first()
-        if not cat:
+        if await db.scalar(select(Cat.id).where(Cat.id == cat_id)) is None:
             raise NotFoundError("Cat", cat_id)
         
         # Initialize AI Agent
@@ -160,14 +282,14 @@ async def get_cat_analysis(
         context = await agent._build_context(cat_id, "comprehensive analysis")
         
         # Perform analysis
-        analysis = await agent.llm_service.analyze_cat_behavior(context.get('cat_data', {}))
+        analysis = await agent.llm_service.analyze_cat_behavior(context.cat_data)
         
         return {
             "success": True,
             "cat_id": cat_id,
             "analysis_period_days": days,
             "analysis": analysis,
-            "context": context,
+            "context": msgspec.to_builtins(context),
             "generated_at": datetime.now().isoformat()
         }
         
@@ -182,12 +304,12 @@ async def get_cat_analysis(
 async def suggest_reminders(
     cat_id: str,
     user_preferences: Dict[str, Any],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get AI-suggested reminders for a cat"""
     try:
-        # Validate cat exists
-        cat = db.query(Cat).filter(Cat.id == cat_id).first()
+        # Validate cat exists; this also loads the row get_cat_data reads below
+        cat = await db.get(Cat, cat_id)
         if not cat:
             raise NotFoundError("Cat", cat_id)
         
@@ -195,7 +317,7 @@ async def suggest_reminders(
         agent = CatAlertAgent(db)
         
         # Get cat data
-        cat_data = agent.tools.get_cat_data(cat_id)
+        cat_data = await agent.tools.get_cat_data(cat_id)
         
         # Generate suggestions
         suggestions = await agent.llm_service.generate_reminder_suggestions(
@@ -2,14 +2,22 @@
 Cats API endpoints
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from datetime import datetime
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
 
-from app.core.database import get_db
+from app.ai.context_cache import invalidate_context
+from app.core.database import get_async_db, is_foreign_key_violation
+from app.core.http_cache import cache_response, etag_response, get_cached
 from app.core.exceptions import NotFoundError, ValidationError
-from app.models import Cat, User
+from app.models import ActivityRecord, ActivityStatus, Cat, HealthRecord
+from app.models.cat import months_since, years_since
 import structlog
 
 logger = structlog.get_logger()
@@ -46,7 +54,9 @@ class CatUpdate(BaseModel):
 
 class CatResponse(BaseModel):
     """Cat response model"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
     name: str
     gender: Optional[str]
     breed: Optional[str]
@@ -62,45 +72,77 @@ class CatResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
 
+# List rows are selected as plain columns and serialized without running
+# them back through response_model validation; ages are derived per row
+_CAT_COLUMNS = tuple(
+    getattr(Cat, field) for field in CatResponse.model_fields
+    if field not in ("age_in_years", "age_in_months")
+)
 
-@router.get("/", response_model=List[CatResponse])
+
+@router.get("/", response_model=None, responses={200: {"model": List[CatResponse]}})
 async def get_cats(
     owner_id: Optional[str] = None,
+    after_id: Optional[UUID] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of cats"""
     try:
-        query = db.query(Cat).filter(Cat.is_active == True)
+        query = select(*_CAT_COLUMNS).where(Cat.is_active.is_(True))
         
         if owner_id:
-            query = query.filter(Cat.owner_id == owner_id)
+            query = query.where(Cat.owner_id == owner_id)
+        
+        # Keyset pagination; skip is kept for existing clients
+        if after_id:
+            query = query.where(Cat.id > after_id)
+        else:
+            query = query.offset(skip)
+        
+        result = await db.execute(query.order_by(Cat.id).limit(limit))
+        cats = [
+            {
+                **row,
+                "age_in_years": years_since(row["birth_date"]),
+                "age_in_months": months_since(row["birth_date"])
+            }
+            for row in result.mappings()
+        ]
         
-        cats = query.offset(skip).limit(limit).all()
+        response = ORJSONResponse(cats)
+        if len(cats) == limit:
+            response.headers["X-Next-Cursor"] = urlencode({"after_id": cats[-1]["id"]})
         
-        return cats
+        return response
         
     except Exception as e:
         logger.error("Error getting cats", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/{cat_id}", response_model=CatResponse)
+@router.get("/{cat_id}", response_model=None, responses={200: {"model": CatResponse}})
 async def get_cat(
     cat_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get cat by ID"""
     try:
-        cat = db.query(Cat).filter(Cat.id == cat_id, Cat.is_active == True).first()
-        if not cat:
-            raise NotFoundError("Cat", cat_id)
+        cached = get_cached(cat_id, "cat")
+        if cached is None:
+            result = await db.execute(
+                select(Cat).where(Cat.id == cat_id, Cat.is_active.is_(True))
+            )
+            cat = result.scalar_one_or_none()
+            if not cat:
+                raise NotFoundError("Cat", cat_id)
+            
+            cached = cache_response(cat_id, "cat", content=CatResponse.model_validate(cat).model_dump())
         
-        return cat
+        return etag_response(request, *cached)
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -113,16 +155,11 @@ async def get_cat(
 async def create_cat(
     cat_data: CatCreate,
     owner_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new cat"""
     try:
-        # Validate owner exists
-        owner = db.query(User).filter(User.id == owner_id).first()
-        if not owner:
-            raise NotFoundError("User", owner_id)
-        
-        # Create cat
+        # Create cat; the owner FK constraint doubles as the existence check
         cat = Cat(
             owner_id=owner_id,
             name=cat_data.name,
@@ -137,16 +174,23 @@ async def create_cat(
             medical_notes=cat_data.medical_notes
         )
         
+        # The flush INSERT ... RETURNING brings back id and server defaults, and
+        # the session does not expire on commit, so no refresh is needed
         db.add(cat)
-        db.commit()
-        db.refresh(cat)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            if not is_foreign_key_violation(e):
+                raise
+            await db.rollback()
+            raise NotFoundError("User", owner_id)
         
         return cat
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error creating cat", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -155,30 +199,32 @@ async def create_cat(
 async def update_cat(
     cat_id: str,
     cat_data: CatUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update cat information"""
     try:
-        cat = db.query(Cat).filter(Cat.id == cat_id, Cat.is_active == True).first()
+        # Update only the sent fields and read back the row in a single statement
+        result = await db.execute(
+            update(Cat)
+            .where(Cat.id == cat_id, Cat.is_active.is_(True))
+            .values(**cat_data.model_dump(exclude_unset=True), updated_at=func.now())
+            .returning(Cat)
+            .execution_options(synchronize_session=False)
+        )
+        cat = result.scalar_one_or_none()
         if not cat:
             raise NotFoundError("Cat", cat_id)
         
-        # Update fields
-        update_data = cat_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(cat, field, value)
-        
-        cat.updated_at = datetime.now()
-        
-        db.commit()
-        db.refresh(cat)
+        response = CatResponse.model_validate(cat)
+        await db.commit()
+        invalidate_context(cat_id)
         
-        return cat
+        return response
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error updating cat", cat_id=cat_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -186,11 +232,14 @@ async def update_cat(
 @router.delete("/{cat_id}")
 async def delete_cat(
     cat_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a cat (soft delete)"""
     try:
-        cat = db.query(Cat).filter(Cat.id == cat_id, Cat.is_active == True).first()
+        result = await db.execute(
+            select(Cat).where(Cat.id == cat_id, Cat.is_active.is_(True))
+        )
+        cat = result.scalar_one_or_none()
         if not cat:
             raise NotFoundError("Cat", cat_id)
         
@@ -198,14 +247,15 @@ async def delete_cat(
         cat.is_active = False
         cat.updated_at = datetime.now()
         
-        db.commit()
+        await db.commit()
+        invalidate_context(cat_id)
         
         return {"message": "Cat deleted successfully"}
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error deleting cat", cat_id=cat_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -213,40 +263,48 @@ async def delete_cat(
 @router.get("/{cat_id}/stats")
 async def get_cat_stats(
     cat_id: str,
+    request: Request,
     days: int = 30,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get cat statistics"""
     try:
-        cat = db.query(Cat).filter(Cat.id == cat_id, Cat.is_active == True).first()
-        if not cat:
-            raise NotFoundError("Cat", cat_id)
+        cached = get_cached(cat_id, "stats", days)
+        if cached is not None:
+            return etag_response(request, *cached)
         
-        from app.models import ActivityRecord, HealthRecord
-        from datetime import timedelta
+        active = await db.scalar(
+            select(Cat.id).where(Cat.id == cat_id, Cat.is_active.is_(True))
+        )
+        if active is None:
+            raise NotFoundError("Cat", cat_id)
         
-        # Get recent activities
-        recent_activities = db.query(ActivityRecord).filter(
-            ActivityRecord.cat_id == cat_id,
-            ActivityRecord.created_at >= datetime.now() - timedelta(days=days)
-        ).all()
+        now = datetime.now()
+        since = now - timedelta(days=days)
         
-        # Get health records
-        health_records = db.query(HealthRecord).filter(
+        # Aggregate activities and count health records in one round trip
+        health_records_count = select(func.count(HealthRecord.id)).where(
             HealthRecord.cat_id == cat_id,
-            HealthRecord.created_at >= datetime.now() - timedelta(days=days)
-        ).all()
+            HealthRecord.created_at >= since
+        ).scalar_subquery()
+        result = await db.execute(
+            select(
+                func.count(ActivityRecord.id),
+                func.count(ActivityRecord.id).filter(ActivityRecord.status == ActivityStatus.COMPLETED),
+                func.avg(ActivityRecord.actual_duration),
+                health_records_count
+            ).where(
+                ActivityRecord.cat_id == cat_id,
+                ActivityRecord.created_at >= since
+            )
+        )
+        total_activities, completed_activities, avg_duration, health_records_count = result.one()
         
         # Calculate statistics
-        total_activities = len(recent_activities)
-        completed_activities = len([a for a in recent_activities if a.status.value == "completed"])
         completion_rate = completed_activities / total_activities if total_activities > 0 else 0
+        avg_duration = float(avg_duration or 0)
         
-        # Calculate average activity duration
-        durations = [a.actual_duration for a in recent_activities if a.actual_duration]
-        avg_duration = sum(durations) / len(durations) if durations else 0
-        
-        return {
+        stats = {
             "cat_id": cat_id,
             "period_days": days,
             "statistics": {
@@ -254,11 +312,13 @@ async def get_cat_stats(
                 "completed_activities": completed_activities,
                 "completion_rate": completion_rate,
                 "avg_activity_duration_minutes": avg_duration,
-                "health_records_count": len(health_records)
+                "health_records_count": health_records_count
             },
-            "generated_at": datetime.now().isoformat()
+            "generated_at": now.isoformat()
         }
         
+        return etag_response(request, *cache_response(cat_id, "stats", days, content=stats))
+        
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -2,12 +2,19 @@
 Health records API endpoints
 """
 from typing import List, Optional
+from urllib.parse import urlencode
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from datetime import datetime
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.ai.context_cache import invalidate_context
+from app.core.database import get_async_db, is_foreign_key_violation
 from app.core.exceptions import NotFoundError
 from app.models import HealthRecord, Cat
 import structlog
@@ -55,8 +62,10 @@ class HealthRecordUpdate(BaseModel):
 
 class HealthRecordResponse(BaseModel):
     """Health record response model"""
-    id: str
-    cat_id: str
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    cat_id: UUID
     record_type: str
     value: Optional[float]
     unit: Optional[str]
@@ -78,35 +87,67 @@ class HealthRecordResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
 
+def _first_and_last(column, *conditions):
+    """Earliest and latest non-null value of a column, ordered by recorded_at"""
+    present = and_(column.isnot(None), *conditions)
+    return (
+        func.array_agg(aggregate_order_by(column, HealthRecord.recorded_at)).filter(present)[1],
+        func.array_agg(aggregate_order_by(column, HealthRecord.recorded_at.desc())).filter(present)[1]
+    )
+
+
+# List rows are selected as plain columns and serialized without running
+# them back through response_model validation
+_HEALTH_RECORD_COLUMNS = tuple(
+    getattr(HealthRecord, field) for field in HealthRecordResponse.model_fields
+)
 
-@router.get("/", response_model=List[HealthRecordResponse])
+
+@router.get("/", response_model=None, responses={200: {"model": List[HealthRecordResponse]}})
 async def get_health_records(
     cat_id: Optional[str] = None,
     record_type: Optional[str] = None,
     days: int = 30,
+    after_ts: Optional[datetime] = None,
+    after_id: Optional[UUID] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of health records"""
     try:
-        from datetime import timedelta
-        
-        query = db.query(HealthRecord).filter(
+        query = select(*_HEALTH_RECORD_COLUMNS).where(
             HealthRecord.created_at >= datetime.now() - timedelta(days=days)
         )
         
         if cat_id:
-            query = query.filter(HealthRecord.cat_id == cat_id)
+            query = query.where(HealthRecord.cat_id == cat_id)
         if record_type:
-            query = query.filter(HealthRecord.record_type == record_type)
+            query = query.where(HealthRecord.record_type == record_type)
         
-        records = query.order_by(HealthRecord.recorded_at.desc()).offset(skip).limit(limit).all()
+        # Keyset pagination on (recorded_at, id); skip is kept for existing clients
+        if after_ts and after_id:
+            query = query.where(
+                tuple_(HealthRecord.recorded_at, HealthRecord.id) < tuple_(after_ts, after_id)
+            )
+        else:
+            query = query.offset(skip)
         
-        return records
+        result = await db.execute(
+            query.order_by(HealthRecord.recorded_at.desc(), HealthRecord.id.desc()).limit(limit)
+        )
+        records = result.mappings().all()
+        
+        response = ORJSONResponse([dict(record) for record in records])
+        if len(records) == limit:
+            last = records[-1]
+            response.headers["X-Next-Cursor"] = urlencode({
+                "after_ts": last["recorded_at"].isoformat(),
+                "after_id": last["id"]
+            })
+        
+        return response
         
     except Exception as e:
         logger.error("Error getting health records", error=str(e))
@@ -116,11 +157,11 @@ async def get_health_records(
 @router.get("/{record_id}", response_model=HealthRecordResponse)
 async def get_health_record(
     record_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get health record by ID"""
     try:
-        record = db.query(HealthRecord).filter(HealthRecord.id == record_id).first()
+        record = await db.get(HealthRecord, record_id)
         if not record:
             raise NotFoundError("HealthRecord", record_id)
         
@@ -136,16 +177,11 @@ async def get_health_record(
 @router.post("/", response_model=HealthRecordResponse)
 async def create_health_record(
     record_data: HealthRecordCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new health record"""
     try:
-        # Validate cat exists
-        cat = db.query(Cat).filter(Cat.id == record_data.cat_id).first()
-        if not cat:
-            raise NotFoundError("Cat", record_data.cat_id)
-        
-        # Create health record
+        # Create health record; the cat FK constraint doubles as the existence check
         record = HealthRecord(
             cat_id=record_data.cat_id,
             record_type=record_data.record_type,
@@ -166,16 +202,24 @@ async def create_health_record(
             recorded_by="user"
         )
         
+        # The flush INSERT ... RETURNING brings back id and server defaults, and
+        # the session does not expire on commit, so no refresh is needed
         db.add(record)
-        db.commit()
-        db.refresh(record)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            if not is_foreign_key_violation(e):
+                raise
+            await db.rollback()
+            raise NotFoundError("Cat", record_data.cat_id)
+        invalidate_context(record.cat_id)
         
         return record
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error creating health record", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -184,30 +228,32 @@ async def create_health_record(
 async def update_health_record(
     record_id: str,
     record_data: HealthRecordUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update health record"""
     try:
-        record = db.query(HealthRecord).filter(HealthRecord.id == record_id).first()
+        # Update only the sent fields and read back the row in a single statement
+        result = await db.execute(
+            update(HealthRecord)
+            .where(HealthRecord.id == record_id)
+            .values(**record_data.model_dump(exclude_unset=True), updated_at=func.now())
+            .returning(HealthRecord)
+            .execution_options(synchronize_session=False)
+        )
+        record = result.scalar_one_or_none()
         if not record:
             raise NotFoundError("HealthRecord", record_id)
         
-        # Update fields
-        update_data = record_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(record, field, value)
-        
-        record.updated_at = datetime.now()
+        response = HealthRecordResponse.model_validate(record)
+        await db.commit()
+        invalidate_context(response.cat_id)
         
-        db.commit()
-        db.refresh(record)
-        
-        return record
+        return response
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error updating health record", record_id=record_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -215,23 +261,25 @@ async def update_health_record(
 @router.delete("/{record_id}")
 async def delete_health_record(
     record_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a health record"""
     try:
-        record = db.query(HealthRecord).filter(HealthRecord.id == record_id).first()
+        record = await db.get(HealthRecord, record_id)
         if not record:
             raise NotFoundError("HealthRecord", record_id)
         
-        db.delete(record)
-        db.commit()
+        cat_id = record.cat_id
+        await db.delete(record)
+        await db.commit()
+        invalidate_context(cat_id)
         
         return {"message": "Health record deleted successfully"}
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error deleting health record", record_id=record_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -240,23 +288,44 @@ async def delete_health_record(
 async def get_health_trends(
     cat_id: str,
     days: int = 30,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get health trends for a cat"""
     try:
-        from datetime import timedelta
+        now = datetime.now()
         
-        # Validate cat exists
-        cat = db.query(Cat).filter(Cat.id == cat_id).first()
-        if not cat:
+        # Cat existence plus earliest/latest readings per metric, in one query;
+        # a single reading yields first == last and therefore "stable"
+        result = await db.execute(
+            select(
+                select(Cat.id).where(Cat.id == cat_id).scalar_subquery(),
+                func.count(HealthRecord.id),
+                *_first_and_last(
+                    HealthRecord.value,
+                    HealthRecord.record_type == "weight",
+                    HealthRecord.value != 0
+                ),
+                *_first_and_last(HealthRecord.activity_level),
+                *_first_and_last(HealthRecord.appetite_level),
+                func.array_agg(
+                    aggregate_order_by(HealthRecord.ai_health_score, HealthRecord.recorded_at.desc())
+                )[1]
+            ).where(
+                HealthRecord.cat_id == cat_id,
+                HealthRecord.created_at >= now - timedelta(days=days)
+            )
+        )
+        (
+            found_cat,
+            total_records,
+            older_weight, recent_weight,
+            older_activity, recent_activity,
+            older_appetite, recent_appetite,
+            latest_health_score
+        ) = result.one()
+        if found_cat is None:
             raise NotFoundError("Cat", cat_id)
         
-        # Get health records
-        records = db.query(HealthRecord).filter(
-            HealthRecord.cat_id == cat_id,
-            HealthRecord.created_at >= datetime.now() - timedelta(days=days)
-        ).order_by(HealthRecord.recorded_at).all()
-        
         # Calculate trends
         trends = {
             "weight_trend": "stable",
@@ -266,10 +335,7 @@ async def get_health_trends(
         }
         
         # Weight trend
-        weight_records = [r for r in records if r.record_type == "weight" and r.value]
-        if len(weight_records) >= 2:
-            recent_weight = weight_records[-1].value
-            older_weight = weight_records[0].value
+        if older_weight is not None:
             weight_change = (recent_weight - older_weight) / older_weight
             
             if weight_change > 0.05:
@@ -278,22 +344,14 @@ async def get_health_trends(
                 trends["weight_trend"] = "decreasing"
         
         # Activity trend
-        activity_records = [r for r in records if r.activity_level is not None]
-        if len(activity_records) >= 2:
-            recent_activity = activity_records[-1].activity_level
-            older_activity = activity_records[0].activity_level
-            
+        if older_activity is not None:
             if recent_activity > older_activity + 1:
                 trends["activity_trend"] = "increasing"
             elif recent_activity < older_activity - 1:
                 trends["activity_trend"] = "decreasing"
         
         # Appetite trend
-        appetite_records = [r for r in records if r.appetite_level is not None]
-        if len(appetite_records) >= 2:
-            recent_appetite = appetite_records[-1].appetite_level
-            older_appetite = appetite_records[0].appetite_level
-            
+        if older_appetite is not None:
             if recent_appetite > older_appetite + 1:
                 trends["appetite_trend"] = "improving"
             elif recent_appetite < older_appetite - 1:
@@ -302,10 +360,10 @@ async def get_health_trends(
         return {
             "cat_id": cat_id,
             "analysis_period_days": days,
-            "total_records": len(records),
+            "total_records": total_records,
             "trends": trends,
-            "latest_health_score": records[-1].ai_health_score if records else None,
-            "generated_at": datetime.now().isoformat()
+            "latest_health_score": latest_health_score,
+            "generated_at": now.isoformat()
         }
         
     except NotFoundError as e:
@@ -2,12 +2,19 @@
 Reminders API endpoints
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from pydantic import BaseModel, ConfigDict
+from starlette.background import BackgroundTask
 from datetime import datetime
+from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal
 from app.core.exceptions import NotFoundError
 from app.models import Reminder, Cat, ReminderTime, ReminderFrequency, CatCareType
 import structlog
@@ -15,6 +22,9 @@ import structlog
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Handlers open their session around the database work only, so the connection
+# is back in the pool before the response is validated and written
+
 
 class ReminderTimeCreate(BaseModel):
     """Reminder time creation model"""
@@ -27,8 +37,8 @@ class ReminderCreate(BaseModel):
     """Reminder creation model"""
     cat_id: str
     title: str
-    type: str
-    frequency: str = "daily"
+    type: CatCareType
+    frequency: ReminderFrequency = ReminderFrequency.DAILY
     description: Optional[str] = None
     priority: int = 1
     scheduled_times: List[ReminderTimeCreate]
@@ -37,21 +47,34 @@ class ReminderCreate(BaseModel):
 class ReminderUpdate(BaseModel):
     """Reminder update model"""
     title: Optional[str] = None
-    type: Optional[str] = None
-    frequency: Optional[str] = None
+    type: Optional[CatCareType] = None
+    frequency: Optional[ReminderFrequency] = None
     description: Optional[str] = None
     priority: Optional[int] = None
     is_enabled: Optional[bool] = None
     scheduled_times: Optional[List[ReminderTimeCreate]] = None
 
 
+class ReminderTimeResponse(BaseModel):
+    """Reminder time response model"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    hour: int
+    minute: int
+    day_of_week: Optional[int]
+    is_enabled: bool
+
+
 class ReminderResponse(BaseModel):
     """Reminder response model"""
-    id: str
-    cat_id: str
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    cat_id: UUID
     title: str
-    type: str
-    frequency: str
+    type: CatCareType
+    frequency: ReminderFrequency
     description: Optional[str]
     priority: int
     is_enabled: bool
@@ -59,102 +82,74 @@ class ReminderResponse(BaseModel):
     completion_rate: float
     created_at: datetime
     updated_at: Optional[datetime]
-    scheduled_times: List[dict]
+    scheduled_times: List[ReminderTimeResponse]
 
-    class Config:
-        from_attributes = True
 
+async def _stream_reminders(db: AsyncSession, result):
+    """Encode reminders as a JSON array while reading them from a server-side cursor"""
+    try:
+        yield b"["
+        separator = b""
+        async for reminder in result.scalars():
+            yield separator + ReminderResponse.model_validate(reminder).model_dump_json().encode()
+            separator = b","
+            # Drop serialized rows so the identity map stays one batch deep; the
+            # scheduled_times cascade has no expunge, so detach the slots too
+            for reminder_time in reminder.scheduled_times:
+                db.expunge(reminder_time)
+            db.expunge(reminder)
+        yield b"]"
+    except Exception as e:
+        # Headers are already sent; all that is left is to cut the body short
+        logger.error("Error streaming reminders", error=str(e))
+        raise
 
-@router.get("/", response_model=List[ReminderResponse])
+
+@router.get("/", response_model=None, responses={200: {"model": List[ReminderResponse]}})
 async def get_reminders(
-    cat_id: Optional[str] = None,
+    cat_id: Optional[UUID] = None,
     is_enabled: Optional[bool] = None,
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    limit: int = 100
 ):
     """Get list of reminders"""
+    query = select(Reminder).options(selectinload(Reminder.scheduled_times))
+    
+    if cat_id:
+        query = query.where(Reminder.cat_id == cat_id)
+    if is_enabled is not None:
+        query = query.where(Reminder.is_enabled == is_enabled)
+    
+    # Open the cursor before any header goes out so query and connection errors
+    # still answer 500; the session stays open until the last row is sent
+    db = AsyncSessionLocal()
     try:
-        query = db.query(Reminder)
-        
-        if cat_id:
-            query = query.filter(Reminder.cat_id == cat_id)
-        if is_enabled is not None:
-            query = query.filter(Reminder.is_enabled == is_enabled)
-        
-        reminders = query.offset(skip).limit(limit).all()
-        
-        # Add scheduled times to response
-        result = []
-        for reminder in reminders:
-            reminder_dict = {
-                "id": str(reminder.id),
-                "cat_id": str(reminder.cat_id),
-                "title": reminder.title,
-                "type": reminder.type.value,
-                "frequency": reminder.frequency.value,
-                "description": reminder.description,
-                "priority": reminder.priority,
-                "is_enabled": reminder.is_enabled,
-                "ai_optimized": reminder.ai_optimized,
-                "completion_rate": reminder.completion_rate,
-                "created_at": reminder.created_at,
-                "updated_at": reminder.updated_at,
-                "scheduled_times": [
-                    {
-                        "id": str(rt.id),
-                        "hour": rt.hour,
-                        "minute": rt.minute,
-                        "day_of_week": rt.day_of_week,
-                        "is_enabled": rt.is_enabled
-                    }
-                    for rt in reminder.scheduled_times
-                ]
-            }
-            result.append(reminder_dict)
-        
-        return result
-        
+        # selectinload runs once per 100-row batch rather than once per reminder
+        result = await db.stream(query.offset(skip).limit(limit).execution_options(yield_per=100))
     except Exception as e:
+        await db.close()
         logger.error("Error getting reminders", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
+    
+    return StreamingResponse(
+        _stream_reminders(db, result),
+        media_type="application/json",
+        background=BackgroundTask(db.close)
+    )
 
 
 @router.get("/{reminder_id}", response_model=ReminderResponse)
 async def get_reminder(
-    reminder_id: str,
-    db: Session = Depends(get_db)
+    reminder_id: str
 ):
     """Get reminder by ID"""
     try:
-        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-        if not reminder:
-            raise NotFoundError("Reminder", reminder_id)
+        async with AsyncSessionLocal() as db:
+            reminder = await db.get(Reminder, reminder_id, options=[selectinload(Reminder.scheduled_times)])
+            if not reminder:
+                raise NotFoundError("Reminder", reminder_id)
         
-        return {
-            "id": str(reminder.id),
-            "cat_id": str(reminder.cat_id),
-            "title": reminder.title,
-            "type": reminder.type.value,
-            "frequency": reminder.frequency.value,
-            "description": reminder.description,
-            "priority": reminder.priority,
-            "is_enabled": reminder.is_enabled,
-            "ai_optimized": reminder.ai_optimized,
-            "completion_rate": reminder.completion_rate,
-            "created_at": reminder.created_at,
-            "updated_at": reminder.updated_at,
-            "scheduled_times": [
-                {
-                    "id": str(rt.id),
-                    "hour": rt.hour,
-                    "minute": rt.minute,
-                    "day_of_week": rt.day_of_week,
-                    "is_enabled": rt.is_enabled
-                }
-                for rt in reminder.scheduled_times
-            ]
-        }
+        return ReminderResponse.model_validate(reminder)
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -165,72 +160,56 @@ async def get_reminder(
 
 @router.post("/", response_model=ReminderResponse)
 async def create_reminder(
-    reminder_data: ReminderCreate,
-    db: Session = Depends(get_db)
+    reminder_data: ReminderCreate
 ):
     """Create a new reminder"""
     try:
-        # Validate cat exists
-        cat = db.query(Cat).filter(Cat.id == reminder_data.cat_id).first()
-        if not cat:
-            raise NotFoundError("Cat", reminder_data.cat_id)
-        
-        # Create reminder
-        reminder = Reminder(
-            cat_id=reminder_data.cat_id,
-            title=reminder_data.title,
-            type=CatCareType(reminder_data.type),
-            frequency=ReminderFrequency(reminder_data.frequency),
-            description=reminder_data.description,
-            priority=reminder_data.priority,
-            is_enabled=True
-        )
-        
-        db.add(reminder)
-        db.flush()  # Get the ID
-        
-        # Create reminder times
-        for time_data in reminder_data.scheduled_times:
-            reminder_time = ReminderTime(
-                reminder_id=reminder.id,
-                hour=time_data.hour,
-                minute=time_data.minute,
-                day_of_week=time_data.day_of_week
+        async with AsyncSessionLocal() as db:
+            # Validate cat exists
+            if await db.scalar(select(Cat.id).where(Cat.id == reminder_data.cat_id)) is None:
+                raise NotFoundError("Cat", reminder_data.cat_id)
+            
+            # Create reminder
+            reminder = Reminder(
+                cat_id=reminder_data.cat_id,
+                title=reminder_data.title,
+                type=reminder_data.type,
+                frequency=reminder_data.frequency,
+                description=reminder_data.description,
+                priority=reminder_data.priority,
+                is_enabled=True
             )
-            db.add(reminder_time)
-        
-        db.commit()
-        db.refresh(reminder)
-        
-        return {
-            "id": str(reminder.id),
-            "cat_id": str(reminder.cat_id),
-            "title": reminder.title,
-            "type": reminder.type.value,
-            "frequency": reminder.frequency.value,
-            "description": reminder.description,
-            "priority": reminder.priority,
-            "is_enabled": reminder.is_enabled,
-            "ai_optimized": reminder.ai_optimized,
-            "completion_rate": reminder.completion_rate,
-            "created_at": reminder.created_at,
-            "updated_at": reminder.updated_at,
-            "scheduled_times": [
-                {
-                    "id": str(rt.id),
-                    "hour": rt.hour,
-                    "minute": rt.minute,
-                    "day_of_week": rt.day_of_week,
-                    "is_enabled": rt.is_enabled
+            
+            db.add(reminder)
+            await db.flush()  # Get the ID
+            
+            # Create reminder times in one batched INSERT; repeated slots are dropped here
+            # and by the slot index. RETURNING hands back the new rows, so the response
+            # needs no reload.
+            slots = {
+                (time_data.hour, time_data.minute, time_data.day_of_week): {
+                    "reminder_id": reminder.id,
+                    "hour": time_data.hour,
+                    "minute": time_data.minute,
+                    "day_of_week": time_data.day_of_week
                 }
-                for rt in reminder.scheduled_times
-            ]
-        }
+                for time_data in reminder_data.scheduled_times or []
+            }
+            scheduled_times = []
+            if slots:
+                scheduled_times = (await db.scalars(
+                    pg_insert(ReminderTime).on_conflict_do_nothing().returning(ReminderTime),
+                    list(slots.values())
+                )).all()
+            set_committed_value(reminder, "scheduled_times", list(scheduled_times))
+            
+            await db.commit()
+        
+        return ReminderResponse.model_validate(reminder)
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
         logger.error("Error creating reminder", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -238,101 +217,84 @@ async def create_reminder(
 @router.put("/{reminder_id}", response_model=ReminderResponse)
 async def update_reminder(
     reminder_id: str,
-    reminder_data: ReminderUpdate,
-    db: Session = Depends(get_db)
+    reminder_data: ReminderUpdate
 ):
     """Update reminder"""
     try:
-        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-        if not reminder:
-            raise NotFoundError("Reminder", reminder_id)
-        
-        # Update fields
-        update_data = reminder_data.dict(exclude_unset=True, exclude={"scheduled_times"})
-        for field, value in update_data.items():
-            if field == "type" and value:
-                setattr(reminder, field, CatCareType(value))
-            elif field == "frequency" and value:
-                setattr(reminder, field, ReminderFrequency(value))
-            else:
+        async with AsyncSessionLocal() as db:
+            reminder = await db.get(Reminder, reminder_id, options=[selectinload(Reminder.scheduled_times)])
+            if not reminder:
+                raise NotFoundError("Reminder", reminder_id)
+            
+            # Update fields; type and frequency arrive already parsed into their enums
+            update_data = reminder_data.model_dump(exclude_unset=True, exclude={"scheduled_times"})
+            for field, value in update_data.items():
                 setattr(reminder, field, value)
-        
-        # Update scheduled times if provided
-        if reminder_data.scheduled_times is not None:
-            # Remove existing times
-            db.query(ReminderTime).filter(ReminderTime.reminder_id == reminder_id).delete()
             
-            # Add new times
-            for time_data in reminder_data.scheduled_times:
-                reminder_time = ReminderTime(
-                    reminder_id=reminder.id,
-                    hour=time_data.hour,
-                    minute=time_data.minute,
-                    day_of_week=time_data.day_of_week
-                )
-                db.add(reminder_time)
-        
-        reminder.updated_at = datetime.now()
-        
-        db.commit()
-        db.refresh(reminder)
-        
-        return {
-            "id": str(reminder.id),
-            "cat_id": str(reminder.cat_id),
-            "title": reminder.title,
-            "type": reminder.type.value,
-            "frequency": reminder.frequency.value,
-            "description": reminder.description,
-            "priority": reminder.priority,
-            "is_enabled": reminder.is_enabled,
-            "ai_optimized": reminder.ai_optimized,
-            "completion_rate": reminder.completion_rate,
-            "created_at": reminder.created_at,
-            "updated_at": reminder.updated_at,
-            "scheduled_times": [
-                {
-                    "id": str(rt.id),
-                    "hour": rt.hour,
-                    "minute": rt.minute,
-                    "day_of_week": rt.day_of_week,
-                    "is_enabled": rt.is_enabled
+            # Update scheduled times if provided
+            if reminder_data.scheduled_times is not None:
+                # Diff against the stored slots so unchanged times are left alone
+                existing = {
+                    (time.hour, time.minute, time.day_of_week): time
+                    for time in reminder.scheduled_times
+                }
+                wanted = {
+                    (time_data.hour, time_data.minute, time_data.day_of_week)
+                    for time_data in reminder_data.scheduled_times
                 }
-                for rt in reminder.scheduled_times
-            ]
-        }
+                
+                removed = [existing[slot].id for slot in existing.keys() - wanted]
+                if removed:
+                    await db.execute(delete(ReminderTime).where(ReminderTime.id.in_(removed)))
+                
+                scheduled_times = [time for slot, time in existing.items() if slot in wanted]
+                added = wanted - existing.keys()
+                if added:
+                    scheduled_times += (await db.scalars(
+                        pg_insert(ReminderTime).on_conflict_do_nothing().returning(ReminderTime),
+                        [
+                            {
+                                "reminder_id": reminder.id,
+                                "hour": hour,
+                                "minute": minute,
+                                "day_of_week": day_of_week
+                            }
+                            for hour, minute, day_of_week in added
+                        ]
+                    )).all()
+                set_committed_value(reminder, "scheduled_times", scheduled_times)
+            
+            reminder.updated_at = datetime.now()
+            
+            await db.commit()
+        
+        return ReminderResponse.model_validate(reminder)
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
         logger.error("Error updating reminder", reminder_id=reminder_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.delete("/{reminder_id}")
 async def delete_reminder(
-    reminder_id: str,
-    db: Session = Depends(get_db)
+    reminder_id: str
 ):
     """Delete a reminder"""
     try:
-        reminder = db.query(Reminder).filter(Reminder.id == reminder_id).first()
-        if not reminder:
-            raise NotFoundError("Reminder", reminder_id)
-        
-        # Delete reminder times first
-        db.query(ReminderTime).filter(ReminderTime.reminder_id == reminder_id).delete()
-        
-        # Delete reminder
-        db.delete(reminder)
-        db.commit()
+        async with AsyncSessionLocal() as db:
+            # Times and activity records go with it through ON DELETE CASCADE
+            result = await db.execute(delete(Reminder).where(Reminder.id == reminder_id))
+            if result.rowcount == 0:
+                raise NotFoundError("Reminder", reminder_id)
+            
+            await db.commit()
         
         return {"message": "Reminder deleted successfully"}
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
         logger.error("Error deleting reminder", reminder_id=reminder_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
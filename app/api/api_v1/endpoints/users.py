@@ -2,12 +2,16 @@
 Users API endpoints
 """
 from typing import List, Optional
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_db, is_unique_violation
 from app.core.exceptions import NotFoundError
 from app.models import User, Cat
 import structlog
@@ -39,7 +43,9 @@ class UserUpdate(BaseModel):
 
 class UserResponse(BaseModel):
     """User response model"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
     username: str
     email: str
     full_name: Optional[str]
@@ -53,18 +59,15 @@ class UserResponse(BaseModel):
     updated_at: Optional[datetime]
     last_login: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user by ID"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise NotFoundError("User", user_id)
         
@@ -80,25 +83,14 @@ async def get_user(
 @router.post("/", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new user"""
     try:
-        # Check if username or email already exists
-        existing_user = db.query(User).filter(
-            (User.username == user_data.username) | (User.email == user_data.email)
-        ).first()
-        
-        if existing_user:
-            raise HTTPException(
-                status_code=400,
-                detail="Username or email already exists"
-            )
-        
         # Hash password (in production, use proper password hashing)
         hashed_password = f"hashed_{user_data.password}"  # Simplified for demo
         
-        # Create user
+        # Create user; the unique indexes on username and email reject duplicates
         user = User(
             username=user_data.username,
             email=user_data.email,
@@ -109,15 +101,23 @@ async def create_user(
         )
         
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            if not is_unique_violation(e):
+                raise
+            await db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail="Username or email already exists"
+            )
         
         return user
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error creating user", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -126,30 +126,29 @@ async def create_user(
 async def update_user(
     user_id: str,
     user_data: UserUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user information"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if not user:
             raise NotFoundError("User", user_id)
         
         # Update fields
-        update_data = user_data.dict(exclude_unset=True)
+        update_data = user_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(user, field, value)
         
         user.updated_at = datetime.now()
         
-        db.commit()
-        db.refresh(user)
+        await db.commit()
         
         return user
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("Error updating user", user_id=user_id, error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -157,33 +156,29 @@ async def update_user(
 @router.get("/{user_id}/cats")
 async def get_user_cats(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get cats owned by a user"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        # Outer join from the user: no rows means no user, a single all-NULL
+        # cat row means a user without active cats
+        result = await db.execute(
+            select(Cat.id, Cat.name, Cat.breed, Cat.health_condition, Cat.created_at)
+            .select_from(User)
+            .outerjoin(Cat, and_(Cat.owner_id == User.id, Cat.is_active.is_(True)))
+            .where(User.id == user_id)
+        )
+        rows = result.mappings().all()
+        if not rows:
             raise NotFoundError("User", user_id)
+        cats = [cat for cat in rows if cat["id"] is not None]
         
-        cats = db.query(Cat).filter(
-            Cat.owner_id == user_id,
-            Cat.is_active == True
-        ).all()
-        
-        return {
+        # orjson encodes the UUID and datetime columns directly
+        return ORJSONResponse({
             "user_id": user_id,
-            "cats": [
-                {
-                    "id": str(cat.id),
-                    "name": cat.name,
-                    "breed": cat.breed,
-                    "health_condition": cat.health_condition,
-                    "created_at": cat.created_at.isoformat()
-                }
-                for cat in cats
-            ],
+            "cats": [dict(cat) for cat in cats],
             "total_count": len(cats)
-        }
+        })
         
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -1,9 +1,10 @@
 """
 Application configuration settings
 """
-from typing import List, Optional
-from pydantic import BaseSettings, validator
-import os
+from functools import lru_cache
+from typing import List
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -19,6 +20,8 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Set when connecting through a transaction-mode pooler such as pgbouncer
+    DATABASE_EXTERNAL_POOL: bool = False
     REDIS_URL: str = "redis://localhost:6379/0"
     
     # Security
@@ -26,7 +29,7 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
-    # CORS
+    # CORS (JSON lists in the environment, e.g. ALLOWED_ORIGINS=["https://a.example"])
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8080"]
     ALLOWED_HOSTS: List[str] = ["*"]
     
@@ -36,34 +39,35 @@ class Settings(BaseSettings):
     
     # AI Agent
     AI_AGENT_ENABLED: bool = True
-    AI_AGENT_MODEL: str = "gpt-4"
+    AI_AGENT_MODEL: str = "gpt-4-1106-preview"
     AI_AGENT_MAX_TOKENS: int = 2000
     AI_AGENT_TEMPERATURE: float = 0.7
+    AI_AGENT_MAX_CONCURRENCY: int = 50
+    
+    # Semantic response cache
+    SEMANTIC_CACHE_ENABLED: bool = True
+    # ada-002 scores unrelated sentences around 0.7-0.8, so only near-paraphrases may hit
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
     
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    # Log one in N 2xx requests; other statuses are always logged
+    ACCESS_LOG_SAMPLE_RATE: int = 1
     
     # Monitoring
     PROMETHEUS_ENABLED: bool = True
     PROMETHEUS_PORT: int = 9090
     
-    @validator("ALLOWED_ORIGINS", pre=True)
-    def assemble_cors_origins(cls, v):
-        if isinstance(v, str):
-            return [i.strip() for i in v.split(",")]
-        return v
-    
-    @validator("ALLOWED_HOSTS", pre=True)
-    def assemble_allowed_hosts(cls, v):
-        if isinstance(v, str):
-            return [i.strip() for i in v.split(",")]
-        return v
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Build the settings once per process"""
+    return Settings()
 
 
 # Create settings instance
-settings = Settings()
+settings = get_settings()
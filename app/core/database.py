@@ -2,27 +2,89 @@
 Database configuration and session management
 """
 from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
+import orjson
+import os
 import redis
+import time
+import uuid
 
 from app.core.config import settings
 
+
+def _json_dumps(value) -> str:
+    """Encode JSONB parameters with orjson"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSONB columns are encoded and decoded with orjson instead of the stdlib json module
+_json_codec = {"json_serializer": _json_dumps, "json_deserializer": orjson.loads}
+
 # PostgreSQL database engine
 engine = create_engine(
     settings.DATABASE_URL,
     poolclass=StaticPool,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **_json_codec
 )
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+
+def _async_database_url(url: str) -> str:
+    """Map the configured database URL onto its asyncio driver"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def _async_pool_options() -> dict:
+    """Pool settings for the async engine"""
+    if settings.DATABASE_EXTERNAL_POOL:
+        # pgbouncer owns the pooling; transaction mode cannot keep
+        # asyncpg's per-connection prepared statements
+        return {"poolclass": NullPool, "connect_args": {"statement_cache_size": 0}}
+    return {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600
+    }
+
+
+# Async PostgreSQL engine
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    **_json_codec,
+    **_async_pool_options()
+)
+
+# Async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (version 7) so new primary keys land at the end of the index"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # Overwrite the version nibble and variant bits of the random tail
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
 # Redis connection
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
@@ -36,6 +98,22 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def is_foreign_key_violation(exc: IntegrityError) -> bool:
+    """Check whether an IntegrityError was raised by a foreign key constraint"""
+    return getattr(exc.orig, "pgcode", None) == "23503"
+
+
+def is_unique_violation(exc: IntegrityError) -> bool:
+    """Check whether an IntegrityError was raised by a unique constraint"""
+    return getattr(exc.orig, "pgcode", None) == "23505"
+
+
 def get_redis():
     """Dependency to get Redis client"""
     return redis_client
@@ -0,0 +1,55 @@
+"""
+Short-lived per-cat cache of serialized GET responses with ETag revalidation
+"""
+from typing import Any, Optional, Tuple
+import hashlib
+import itertools
+from cachetools import TTLCache
+from fastapi import Request, Response
+import orjson
+
+# Mobile clients poll cat detail and stats; the data moves on the order of
+# minutes, and every write to a cat's records invalidates it anyway
+RESPONSE_TTL_SECONDS = 30
+
+_responses: "TTLCache[Tuple, Tuple[bytes, str]]" = TTLCache(maxsize=10_000, ttl=RESPONSE_TTL_SECONDS)
+
+# Bumped on invalidation so stale entries are never looked up again and
+# simply age out, instead of scanning the cache for a cat's keys. New
+# generations come from one process-wide counter and never repeat, so a cat
+# whose entry expired (falling back to 0) cannot land on an older body again;
+# generation 0 bodies predating the bump are gone before the entry expires.
+_generations: "TTLCache[str, int]" = TTLCache(maxsize=10_000, ttl=RESPONSE_TTL_SECONDS)
+_generation_seq = itertools.count(1)
+
+
+def _key(cat_id: Any, variant: Tuple) -> Tuple:
+    """Cache key for one response variant of a cat"""
+    cat_key = str(cat_id).lower()
+    return (cat_key, _generations.get(cat_key, 0)) + variant
+
+
+def get_cached(cat_id: Any, *variant: Any) -> Optional[Tuple[bytes, str]]:
+    """Return the cached (body, etag) for a cat response, if still fresh"""
+    return _responses.get(_key(cat_id, variant))
+
+
+def cache_response(cat_id: Any, *variant: Any, content: Any) -> Tuple[bytes, str]:
+    """Serialize a response body, store it with its ETag and return both"""
+    body = orjson.dumps(content)
+    etag = 'W/"' + hashlib.md5(body).hexdigest() + '"'
+    _responses[_key(cat_id, variant)] = (body, etag)
+    return body, etag
+
+
+def invalidate_cat(cat_id: Any):
+    """Forget every cached response for a cat"""
+    _generations[str(cat_id).lower()] = next(_generation_seq)
+
+
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """Answer 304 when the client already holds this body, else send it"""
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={RESPONSE_TTL_SECONDS}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -4,17 +4,44 @@ CatAlert Backend Main Application
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from brotli_asgi import BrotliMiddleware
+from logging.handlers import QueueHandler, QueueListener
+import itertools
+import logging
+import queue
+import sys
 import time
+import numpy as np
+import orjson
 import structlog
 
 from app.core.config import settings
 from app.core.database import engine
 from app.models import Base
 from app.api.api_v1.api import api_router
+from app.ai.daily_stats import compute_daily_features
+from app.ai.interaction_writer import interaction_writer
+from app.ai.llm_service import get_llm_service
+from app.ai.tools import _trend_stats
 from app.core.exceptions import CatAlertException
 
 # Configure structured logging
+def _orjson_dumps(obj, **kwargs) -> str:
+    """JSON serializer for structlog's renderer"""
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
+
+# Request handlers only enqueue records; a listener thread does the stdout I/O
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+logging.basicConfig(
+    level=settings.LOG_LEVEL,
+    format="%(message)s",
+    handlers=[QueueHandler(_log_queue)]
+)
+_log_listener.start()
+
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
@@ -25,7 +52,7 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -35,8 +62,23 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Access logs skip the stack/exception renderers; they never carry either
+_access_stdlib_logger = logging.getLogger("catalert.access")
+access_logger = structlog.wrap_logger(
+    _access_stdlib_logger,
+    processors=[
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    ],
+    context_class=dict,
+    wrapper_class=structlog.stdlib.BoundLogger,
+    cache_logger_on_first_use=True,
+)
+_access_log_counter = itertools.count()
+
+# Create database tables in development; production schemas come from migrations
+if settings.DEBUG:
+    Base.metadata.create_all(bind=engine)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -46,6 +88,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Add middleware
@@ -62,29 +105,37 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# Compress large JSON payloads; clients without Brotli fall back to gzip.
+# SSE streams are excluded so deltas are not buffered by the compressor.
+app.add_middleware(
+    BrotliMiddleware,
+    quality=4,
+    minimum_size=1024,
+    gzip_fallback=True,
+    excluded_handlers=[r".*/chat/stream$"]
+)
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log request
-    logger.info(
-        "Request started",
-        method=request.method,
-        url=str(request.url),
-        client_ip=request.client.host,
-    )
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
-    # Log response
-    process_time = time.time() - start_time
-    logger.info(
+    # Log every non-2xx response and 1 in ACCESS_LOG_SAMPLE_RATE of the rest
+    status_code = response.status_code
+    if not _access_stdlib_logger.isEnabledFor(logging.INFO):
+        return response
+    if 200 <= status_code < 300 and next(_access_log_counter) % settings.ACCESS_LOG_SAMPLE_RATE:
+        return response
+    
+    access_logger.info(
         "Request completed",
         method=request.method,
         url=str(request.url),
-        status_code=response.status_code,
-        process_time=process_time,
+        client_ip=request.client.host if request.client else None,
+        status_code=status_code,
+        process_time=time.perf_counter() - start_time,
     )
     
     return response
@@ -107,6 +158,28 @@ async def cat_alert_exception_handler(request: Request, exc: CatAlertException):
         }
     )
 
+# Warm up per-worker state so the first user request does not pay for it
+@app.on_event("startup")
+async def warmup():
+    empty = np.zeros(0, dtype=np.float64)
+    _trend_stats(np.zeros(2), np.ones(2), np.ones(1, dtype=np.bool_), np.zeros(1, dtype=np.bool_))
+    compute_daily_features(1, np.zeros(0, dtype=np.intp), empty, np.zeros(0, dtype=np.intp), empty, empty)
+    
+    # Build the OpenAPI schema and the Pydantic models behind it
+    app.openapi()
+    
+    # Open a connection to OpenAI so the TLS handshake is done up front
+    try:
+        await get_llm_service().chat_completion([{"role": "user", "content": "ping"}], max_tokens=1)
+    except Exception as e:
+        logger.warning("LLM warmup failed", error=str(e))
+
+# Flush queued AI interactions before the worker exits
+@app.on_event("shutdown")
+async def flush_interactions():
+    await interaction_writer.stop()
+    _log_listener.stop()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -128,5 +201,7 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.LOG_LEVEL.lower()
     )
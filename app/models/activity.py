@@ -1,14 +1,26 @@
 """
 Activity models for CatAlert application
 """
-from sqlalchemy import Column, String, DateTime, Integer, Float, ForeignKey, Enum, Text
+from sqlalchemy import DDL, Column, String, DateTime, Integer, Float, ForeignKey, Enum, Text, Boolean, Index, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
+from datetime import datetime
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
+from app.models.reminder import CatCareType, _enum_values
+
+
+# Display names for activity types
+_TYPE_MAP = {
+    CatCareType.FOOD: "喂食",
+    CatCareType.WATER: "换水",
+    CatCareType.PLAY: "玩耍",
+    CatCareType.MEDICATION: "喂药",
+    CatCareType.VET_VISIT: "看兽医",
+    CatCareType.GROOMING: "美容"
+}
 
 
 class ActivityStatus(enum.Enum):
@@ -23,16 +35,26 @@ class ActivityStatus(enum.Enum):
 class ActivityRecord(Base):
     """Activity record model - extends iOS ActivityRecord"""
     __tablename__ = "activity_records"
+    __table_args__ = (
+        Index("ix_activity_cat_created", "cat_id", "created_at"),
+        Index("ix_act_cat_sched", "cat_id", "scheduled_time"),
+        # Partial index for overdue scans; Enum columns store member names
+        Index("ix_act_pending_sched", "scheduled_time", postgresql_where=text("status = 'PENDING'")),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    reminder_id = Column(UUID(as_uuid=True), ForeignKey("reminders.id"), nullable=False)
-    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    reminder_id = Column(UUID(as_uuid=True), ForeignKey("reminders.id", ondelete="CASCADE"), nullable=False, index=True)
+    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id", ondelete="CASCADE"), nullable=False)
     
     # Basic information (from iOS ActivityRecord)
-    type = Column(Enum(CatCareType), nullable=False)
+    type = Column(
+        Enum(CatCareType, name="ck_activity_type", native_enum=False, create_constraint=True,
+             length=16, values_callable=_enum_values),
+        nullable=False
+    )
     scheduled_time = Column(DateTime(timezone=True), nullable=False)
     complete_time = Column(DateTime(timezone=True))
-    status = Column(Enum(ActivityStatus), default=ActivityStatus.PENDING)
+    status = Column(Enum(ActivityStatus), default=ActivityStatus.PENDING, index=True)
     
     # Extended information
     actual_duration = Column(Integer)  # actual duration in minutes
@@ -59,23 +81,15 @@ class ActivityRecord(Base):
     @property
     def type_string(self):
         """Get display name for activity type"""
-        type_map = {
-            CatCareType.FOOD: "喂食",
-            CatCareType.WATER: "换水",
-            CatCareType.PLAY: "玩耍",
-            CatCareType.MEDICATION: "喂药",
-            CatCareType.VET_VISIT: "看兽医",
-            CatCareType.GROOMING: "美容"
-        }
-        return type_map.get(self.type, "未知")
+        return _TYPE_MAP.get(self.type, "未知")
     
     @property
     def is_overdue(self):
         """Check if activity is overdue"""
         if self.status != ActivityStatus.PENDING:
             return False
-        from datetime import datetime
-        return datetime.now() > self.scheduled_time
+        # scheduled_time is timezone-aware; compare against an aware "now"
+        return datetime.now(self.scheduled_time.tzinfo) > self.scheduled_time
     
     @property
     def completion_delay_minutes(self):
@@ -83,3 +97,36 @@ class ActivityRecord(Base):
         if not self.complete_time or not self.scheduled_time:
             return None
         return (self.complete_time - self.scheduled_time).total_seconds() / 60
+
+
+# Keep reminders.scheduled_count/completed_count in step with their activity rows
+# (create_all installs it here; migrated databases get it from alembic revision 0005)
+_COMPLETION_COUNTERS = DDL("""
+CREATE OR REPLACE FUNCTION reminder_completion_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.reminder_id = NEW.reminder_id THEN
+        UPDATE reminders SET completed_count = completed_count
+            + (NEW.status IS NOT DISTINCT FROM 'COMPLETED')::int
+            - (OLD.status IS NOT DISTINCT FROM 'COMPLETED')::int
+        WHERE id = NEW.reminder_id;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE reminders SET scheduled_count = scheduled_count - 1,
+            completed_count = completed_count - (OLD.status IS NOT DISTINCT FROM 'COMPLETED')::int
+        WHERE id = OLD.reminder_id;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        UPDATE reminders SET scheduled_count = scheduled_count + 1,
+            completed_count = completed_count + (NEW.status IS NOT DISTINCT FROM 'COMPLETED')::int
+        WHERE id = NEW.reminder_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER activity_records_completion_counters
+AFTER INSERT OR DELETE OR UPDATE OF status, reminder_id ON activity_records
+FOR EACH ROW EXECUTE FUNCTION reminder_completion_counters();
+""")
+event.listen(ActivityRecord.__table__, "after_create", _COMPLETION_COUNTERS.execute_if(dialect="postgresql"))
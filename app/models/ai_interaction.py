@@ -1,31 +1,36 @@
 """
 AI interaction models for CatAlert application
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Boolean, Integer
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Boolean, Integer, Float
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
-import uuid
+from datetime import datetime
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
+
+
+# Response quality indexed by user rating, clamped to 0-5
+_RATING_QUALITY = ("poor", "poor", "fair", "good", "excellent", "excellent")
 
 
 class AIInteraction(Base):
     """AI interaction model for tracking user-AI conversations"""
     __tablename__ = "ai_interactions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id"))
+    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id", ondelete="SET NULL"))
     
-    # Interaction details
+    # Interaction details; the bulky payload columns are deferred so analytics
+    # loads read only the narrow columns unless the text is asked for
     session_id = Column(String(100), nullable=False, index=True)
     interaction_type = Column(String(50), nullable=False)  # "chat", "analysis", "recommendation"
-    user_input = Column(Text, nullable=False)
-    ai_response = Column(Text, nullable=False)
+    user_input = deferred(Column(Text, nullable=False), group="payload")
+    ai_response = deferred(Column(Text, nullable=False), group="payload")
     
     # Context and metadata
-    context = Column(JSONB)  # additional context data
+    context = deferred(Column(JSONB), group="payload")  # additional context data
     intent = Column(String(100))  # detected user intent
     confidence_score = Column(Float)  # AI confidence in response
     processing_time_ms = Column(Integer)  # response time in milliseconds
@@ -37,7 +42,7 @@ class AIInteraction(Base):
     
     # User feedback
     user_rating = Column(Integer)  # 1-5 rating
-    user_feedback = Column(Text)
+    user_feedback = deferred(Column(Text), group="payload")
     was_helpful = Column(Boolean)
     
     # Metadata
@@ -56,22 +61,15 @@ class AIInteraction(Base):
         """Get response quality based on user feedback"""
         if self.user_rating is None:
             return "unknown"
-        elif self.user_rating >= 4:
-            return "excellent"
-        elif self.user_rating >= 3:
-            return "good"
-        elif self.user_rating >= 2:
-            return "fair"
-        else:
-            return "poor"
+        return _RATING_QUALITY[max(0, min(5, self.user_rating))]
 
 
 class AIInsight(Base):
     """AI insight model for storing generated insights"""
     __tablename__ = "ai_insights"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id", ondelete="CASCADE"), nullable=False)
     
     # Insight details
     insight_type = Column(String(50), nullable=False)  # "health", "behavior", "pattern", "recommendation"
@@ -82,11 +80,11 @@ class AIInsight(Base):
     # Data analysis
     analysis_period = Column(String(50))  # "7d", "30d", "90d"
     data_points_analyzed = Column(Integer)
-    key_findings = Column(JSONB)
-    supporting_evidence = Column(JSONB)
+    key_findings = deferred(Column(JSONB), group="jsonb")
+    supporting_evidence = deferred(Column(JSONB), group="jsonb")
     
     # Recommendations
-    recommendations = Column(JSONB)  # list of recommendations
+    recommendations = deferred(Column(JSONB), group="jsonb")  # list of recommendations
     priority = Column(String(20))  # "low", "medium", "high", "urgent"
     actionable = Column(Boolean, default=True)
     
@@ -112,5 +110,4 @@ class AIInsight(Base):
         """Check if insight is expired"""
         if not self.expires_at:
             return False
-        from datetime import datetime
         return datetime.now() > self.expires_at
@@ -1,20 +1,42 @@
 """
 Cat model for CatAlert application
 """
-from sqlalchemy import Column, String, DateTime, Integer, Float, Text, ForeignKey, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, Float, Text, ForeignKey, Boolean, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
+from datetime import datetime
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
+
+
+def months_since(birth_date):
+    """Whole calendar months elapsed since a birth date"""
+    if not birth_date:
+        return None
+    now = datetime.now()
+    return (now.year - birth_date.year) * 12 + (now.month - birth_date.month)
+
+
+def years_since(birth_date):
+    """Calendar years elapsed since a birth date"""
+    if not birth_date:
+        return None
+    return datetime.now().year - birth_date.year
 
 
 class Cat(Base):
     """Cat model - extends iOS CatModel"""
     __tablename__ = "cats"
+    __table_args__ = (
+        # Partial index: list queries only ever look at active cats
+        Index("ix_cats_owner_active", "owner_id", postgresql_where=text("is_active")),
+        # images is one JSONB array document, never a Postgres array of JSONB
+        CheckConstraint("jsonb_typeof(images) = 'array'", name="ck_cats_images_array"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
     # Basic information (from iOS CatModel)
@@ -44,29 +66,36 @@ class Cat(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_active = Column(Boolean, default=True)
     
-    # Relationships
-    owner = relationship("User", back_populates="cats")
-    reminders = relationship("Reminder", back_populates="cat", cascade="all, delete-orphan")
-    activities = relationship("ActivityRecord", back_populates="cat", cascade="all, delete-orphan")
-    health_records = relationship("HealthRecord", back_populates="cat", cascade="all, delete-orphan")
+    # Relationships; never lazy-loaded, queries that need them use selectinload
+    owner = relationship("User", back_populates="cats", lazy="raise")
+    # Children are removed by ON DELETE CASCADE in the database, not by the ORM
+    reminders = relationship("Reminder", back_populates="cat", cascade="save-update, merge", passive_deletes=True, lazy="raise")
+    activities = relationship("ActivityRecord", back_populates="cat", cascade="save-update, merge", passive_deletes=True, lazy="raise")
+    health_records = relationship("HealthRecord", back_populates="cat", cascade="save-update, merge", passive_deletes=True, lazy="raise")
     
     def __repr__(self):
         return f"<Cat(id={self.id}, name={self.name}, owner_id={self.owner_id})>"
     
-    @property
+    @hybrid_property
     def age_in_months(self):
         """Calculate age in months"""
-        if not self.birth_date:
-            return None
-        from datetime import datetime
-        now = datetime.now()
-        return (now.year - self.birth_date.year) * 12 + (now.month - self.birth_date.month)
+        return months_since(self.birth_date)
+    
+    @age_in_months.expression
+    def age_in_months(cls):
+        """Same calendar-month arithmetic in SQL, usable in WHERE/ORDER BY"""
+        now = func.now()
+        return (
+            (func.extract("year", now) - func.extract("year", cls.birth_date)) * 12
+            + func.extract("month", now) - func.extract("month", cls.birth_date)
+        )
     
-    @property
+    @hybrid_property
     def age_in_years(self):
         """Calculate age in years"""
-        if not self.birth_date:
-            return None
-        from datetime import datetime
-        now = datetime.now()
-        return now.year - self.birth_date.year
+        return years_since(self.birth_date)
+    
+    @age_in_years.expression
+    def age_in_years(cls):
+        """Same calendar-year arithmetic in SQL"""
+        return func.extract("year", func.now()) - func.extract("year", cls.birth_date)
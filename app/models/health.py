@@ -1,21 +1,27 @@
 """
 Health record models for CatAlert application
 """
-from sqlalchemy import Column, String, DateTime, Integer, Float, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, Float, ForeignKey, Text, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
-import uuid
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class HealthRecord(Base):
     """Health record model for tracking cat health"""
     __tablename__ = "health_records"
+    __table_args__ = (
+        Index("ix_health_cat_created", "cat_id", "created_at"),
+        Index("ix_health_cat_type_created", "cat_id", "record_type", "created_at"),
+        Index("ix_health_cat_recorded", "cat_id", "recorded_at"),
+        # Rows arrive in created_at order, so a BRIN covers cross-cat time windows cheaply
+        Index("ix_health_created_brin", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id", ondelete="CASCADE"), nullable=False)
     
     # Basic health information
     record_type = Column(String(50), nullable=False)  # "weight", "temperature", "vaccination", etc.
@@ -36,15 +42,15 @@ class HealthRecord(Base):
     eye_condition = Column(String(50))
     ear_condition = Column(String(50))
     
-    # Behavioral observations
+    # Behavioral observations; JSONB detail is deferred, load it with undefer_group("jsonb")
     behavior_notes = Column(Text)
-    unusual_behaviors = Column(JSONB)  # list of unusual behaviors
-    stress_indicators = Column(JSONB)  # stress-related observations
+    unusual_behaviors = deferred(Column(JSONB), group="jsonb")  # list of unusual behaviors
+    stress_indicators = deferred(Column(JSONB), group="jsonb")  # stress-related observations
     
     # AI analysis
     ai_health_score = Column(Float)  # 0.0-1.0 overall health score
-    ai_risk_factors = Column(JSONB)  # identified risk factors
-    ai_recommendations = Column(JSONB)  # AI-generated recommendations
+    ai_risk_factors = deferred(Column(JSONB), group="jsonb")  # identified risk factors
+    ai_recommendations = deferred(Column(JSONB), group="jsonb")  # AI-generated recommendations
     anomaly_detected = Column(Boolean, default=False)
     
     # Metadata
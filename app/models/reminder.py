@@ -1,14 +1,14 @@
 """
 Reminder models for CatAlert application
 """
-from sqlalchemy import Column, String, DateTime, Boolean, Integer, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Boolean, BigInteger, Integer, Float, Text, ForeignKey, Enum, Index, cast, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, uuid7
 
 
 class ReminderFrequency(enum.Enum):
@@ -29,12 +29,39 @@ class CatCareType(enum.Enum):
     GROOMING = "grooming"
 
 
+def _enum_values(enum_class):
+    """Persist enum values ("food"), not member names, in VARCHAR enum columns"""
+    return [member.value for member in enum_class]
+
+
+# Display names for frequencies and care types
+_FREQUENCY_DISPLAY = {
+    ReminderFrequency.DAILY: "每天",
+    ReminderFrequency.WEEKLY: "每周",
+    ReminderFrequency.MONTHLY: "每月",
+    ReminderFrequency.CUSTOM: "自定义"
+}
+
+_CARE_TYPE_DISPLAY = {
+    CatCareType.FOOD: "喂食",
+    CatCareType.WATER: "喂水",
+    CatCareType.PLAY: "玩耍",
+    CatCareType.MEDICATION: "喂药",
+    CatCareType.VET_VISIT: "看兽医",
+    CatCareType.GROOMING: "美容"
+}
+
+
 class ReminderTime(Base):
     """Reminder time model"""
     __tablename__ = "reminder_times"
+    __table_args__ = (
+        # Daily slots have no day_of_week; coalesce so NULLs still collide
+        Index("ux_reminder_times_slot", "reminder_id", "hour", "minute", text("coalesce(day_of_week, -1)"), unique=True),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    reminder_id = Column(UUID(as_uuid=True), ForeignKey("reminders.id"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    reminder_id = Column(UUID(as_uuid=True), ForeignKey("reminders.id", ondelete="CASCADE"), nullable=False)
     hour = Column(Integer, nullable=False)  # 0-23
     minute = Column(Integer, nullable=False)  # 0-59
     day_of_week = Column(Integer)  # 0-6 (Monday-Sunday), None for daily
@@ -50,14 +77,26 @@ class ReminderTime(Base):
 class Reminder(Base):
     """Reminder model - extends iOS CatReminder"""
     __tablename__ = "reminders"
+    __table_args__ = (
+        Index("ix_reminders_cat_enabled", "cat_id", "is_enabled"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    cat_id = Column(UUID(as_uuid=True), ForeignKey("cats.id", ondelete="CASCADE"), nullable=False)
     
     # Basic information (from iOS CatReminder)
     title = Column(String(200), nullable=False)
-    type = Column(Enum(CatCareType), nullable=False)
-    frequency = Column(Enum(ReminderFrequency), default=ReminderFrequency.DAILY)
+    # VARCHAR + CHECK rather than PG ENUM types, so new values need no ALTER TYPE
+    type = Column(
+        Enum(CatCareType, name="ck_reminder_type", native_enum=False, create_constraint=True,
+             length=16, values_callable=_enum_values),
+        nullable=False
+    )
+    frequency = Column(
+        Enum(ReminderFrequency, name="ck_reminder_frequency", native_enum=False, create_constraint=True,
+             length=16, values_callable=_enum_values),
+        default=ReminderFrequency.DAILY
+    )
     is_enabled = Column(Boolean, default=True)
     
     # Extended information
@@ -68,7 +107,10 @@ class Reminder(Base):
     # AI optimization
     ai_optimized = Column(Boolean, default=False)
     optimal_times = Column(JSONB)  # AI suggested optimal times
-    completion_rate = Column(Float, default=0.0)  # 0.0-1.0
+    
+    # Activity counters kept current by a trigger on activity_records (see activity.py)
+    scheduled_count = Column(BigInteger, nullable=False, server_default="0")
+    completed_count = Column(BigInteger, nullable=False, server_default="0")
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -77,8 +119,8 @@ class Reminder(Base):
     
     # Relationships
     cat = relationship("Cat", back_populates="reminders")
-    scheduled_times = relationship("ReminderTime", back_populates="reminder", cascade="all, delete-orphan")
-    activities = relationship("ActivityRecord", back_populates="reminder")
+    scheduled_times = relationship("ReminderTime", back_populates="reminder", cascade="save-update, merge", passive_deletes=True)
+    activities = relationship("ActivityRecord", back_populates="reminder", passive_deletes=True)
     
     def __repr__(self):
         return f"<Reminder(id={self.id}, title={self.title}, type={self.type.value})>"
@@ -86,23 +128,21 @@ class Reminder(Base):
     @property
     def display_frequency(self):
         """Get display name for frequency"""
-        frequency_map = {
-            ReminderFrequency.DAILY: "每天",
-            ReminderFrequency.WEEKLY: "每周", 
-            ReminderFrequency.MONTHLY: "每月",
-            ReminderFrequency.CUSTOM: "自定义"
-        }
-        return frequency_map.get(self.frequency, "未知")
+        return _FREQUENCY_DISPLAY.get(self.frequency, "未知")
     
     @property
     def display_type(self):
         """Get display name for care type"""
-        type_map = {
-            CatCareType.FOOD: "喂食",
-            CatCareType.WATER: "喂水",
-            CatCareType.PLAY: "玩耍",
-            CatCareType.MEDICATION: "喂药",
-            CatCareType.VET_VISIT: "看兽医",
-            CatCareType.GROOMING: "美容"
-        }
-        return type_map.get(self.type, "未知")
+        return _CARE_TYPE_DISPLAY.get(self.type, "未知")
+    
+    @hybrid_property
+    def completion_rate(self):
+        """Share of this reminder's activities that were completed, 0.0-1.0"""
+        if not self.scheduled_count:
+            return 0.0
+        return self.completed_count / self.scheduled_count
+    
+    @completion_rate.expression
+    def completion_rate(cls):
+        """Same ratio in SQL"""
+        return func.coalesce(cast(cls.completed_count, Float) / func.nullif(cls.scheduled_count, 0), 0.0)
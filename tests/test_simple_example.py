@@ -0,0 +1,103 @@
+"""
+Tests for the endpoints in SIMPLE_EXAMPLE.py
+"""
+import httpx
+import pytest
+import pytest_asyncio
+
+import SIMPLE_EXAMPLE as example
+
+
+@pytest_asyncio.fixture
+async def client():
+    """Client bound to the example app; restores the in-memory database afterwards"""
+    saved = dict(example.cats_database)
+    async with httpx.AsyncClient(app=example.app, base_url="http://test") as client:
+        yield client
+    example.cats_database.clear()
+    example.cats_database.update(saved)
+
+
+@pytest.mark.asyncio
+async def test_read_root(client):
+    response = await client.get("/")
+    
+    assert response.status_code == 200
+    assert response.json() == {"message": "欢迎使用CatAlert API！", "Hello": "World"}
+
+
+@pytest.mark.asyncio
+async def test_get_all_cats(client):
+    response = await client.get("/cats")
+    
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": 1, "name": "胡胡", "age": 4, "breed": "英短", "owner_name": "小明"},
+        {"id": 2, "name": "咪咪", "age": 2, "breed": "美短", "owner_name": "小红"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_cat_by_id(client):
+    response = await client.get("/cats/2")
+    
+    assert response.status_code == 200
+    assert response.json() == {"id": 2, "name": "咪咪", "age": 2, "breed": "美短", "owner_name": "小红"}
+
+
+@pytest.mark.asyncio
+async def test_create_cat_assigns_new_id(client):
+    payload = {"name": "橘子", "age": 1, "breed": "中华田园猫", "owner_name": "小刚"}
+    
+    response = await client.post("/cats", json=payload)
+    
+    assert response.status_code == 200
+    created = response.json()
+    assert created == {**payload, "id": created["id"]}
+    assert created["id"] not in (1, 2)
+    
+    fetched = await client.get(f"/cats/{created['id']}")
+    assert fetched.json() == created
+    assert len((await client.get("/cats")).json()) == 3
+
+
+@pytest.mark.asyncio
+async def test_create_cat_rejects_missing_fields(client):
+    response = await client.post("/cats", json={"name": "橘子"})
+    
+    assert response.status_code == 422
+    assert len(example.cats_database) == 2
+
+
+@pytest.mark.asyncio
+async def test_ai_analysis(client):
+    response = await client.get("/cats/1/ai-analysis")
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cat_name"] == "胡胡"
+    assert body["health_score"] == 0.8
+    assert body["recommendations"] == [
+        "胡胡的年龄是4岁，建议定期体检",
+        "英短品种需要特别注意饮食",
+        "建议每天至少15分钟的玩耍时间"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ai_analysis_unknown_cat(client):
+    response = await client.get("/cats/99/ai-analysis")
+    
+    assert response.status_code == 200
+    assert response.json() == {"error": "猫咪不存在"}
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped(client):
+    for i in range(20):
+        await client.post("/cats", json={"name": f"猫{i}", "age": i, "breed": "英短", "owner_name": "小明"})
+    
+    response = await client.get("/cats", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 22